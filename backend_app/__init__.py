@@ -12,6 +12,10 @@ def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
 
+    # orjson-backed jsonify()/request.get_json() (standard json if orjson is missing)
+    from backend_app.utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+
     # ⚠️ CRITICAL FIX: Handle CORS properly
     # Allow credentials and handle OPTIONS requests
     app.config['CORS_SUPPORTS_CREDENTIALS'] = True
@@ -82,6 +86,18 @@ def create_app(config_class=Config):
     app.register_blueprint(user_bp, url_prefix='/api/users')
     app.register_blueprint(style_bp, url_prefix='/api/themes')
 
+    # Guest carts in SQL or a key-value store (CART_STORE)
+    from backend_app.services.cart_store import init_cart_store
+    init_cart_store(app)
+
+    # gzip/brotli response compression negotiated by Accept-Encoding
+    from backend_app.utils.compression import init_compression
+    init_compression(app)
+
+    # CLI maintenance commands (flask backfill-order-rollups, ...)
+    from backend_app.commands import register_commands
+    register_commands(app)
+
     # ✅ Auto-create tables if they don't exist
     with app.app_context():
         # Create necessary upload directories
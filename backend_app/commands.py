@@ -0,0 +1,32 @@
+# backend_app/commands.py
+import click
+
+
+def register_commands(app):
+    """Attach maintenance commands to the `flask` CLI"""
+
+    @app.cli.command('backfill-order-rollups')
+    def backfill_order_rollups():
+        """Rebuild daily_order_rollups from the orders table."""
+        from backend_app.services.order_rollup_service import OrderRollupService
+
+        rows = OrderRollupService.rebuild()
+        click.echo(f"✅ Rebuilt daily order rollups ({rows} rows)")
+
+    @app.cli.command('release-expired-holds')
+    @click.option('--batch-size', default=500, show_default=True, help='Orders released per transaction.')
+    def release_expired_holds(batch_size):
+        """Cancel unpaid orders whose inventory holds expired and restock them."""
+        from backend_app.services.inventory_service import InventoryService
+
+        released = InventoryService.release_expired_holds(batch_size=batch_size)
+        click.echo(f"✅ Released inventory holds for {released} expired orders")
+
+    @app.cli.command('sweep-guest-carts')
+    @click.option('--batch-size', default=500, show_default=True, help='Carts deleted per transaction.')
+    def sweep_guest_carts(batch_size):
+        """Delete guest carts left idle for longer than GUEST_CART_TTL."""
+        from backend_app.services.cart_service import CartService
+
+        deleted = CartService.sweep_guest_carts(app.config['GUEST_CART_TTL'], batch_size=batch_size)
+        click.echo(f"✅ Deleted {deleted} abandoned guest carts")
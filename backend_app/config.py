@@ -5,6 +5,10 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'your-secret-key-here')
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=1)
+    # Authorize from role/brand_id claims instead of loading the user on every request
+    JWT_CLAIMS_AUTH = os.environ.get('JWT_CLAIMS_AUTH', 'false').lower() == 'true'
+    # Seconds a user's token_version may be served from memory; revocation lags by at most this
+    JWT_TOKEN_VERSION_TTL = int(os.environ.get('JWT_TOKEN_VERSION_TTL', 60))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
     # ✅ Use PostgreSQL instead of SQLite
@@ -16,3 +20,28 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'static', 'uploads')
     ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
+
+    # Catalog pagination (cursor mode on GET /api/products/)
+    PRODUCTS_PAGE_SIZE = int(os.environ.get('PRODUCTS_PAGE_SIZE', 24))
+    PRODUCTS_MAX_PAGE_SIZE = int(os.environ.get('PRODUCTS_MAX_PAGE_SIZE', 100))
+
+    # Bulk catalog import (POST /api/products/import)
+    PRODUCT_IMPORT_MAX_BYTES = int(os.environ.get('PRODUCT_IMPORT_MAX_BYTES', 200 * 1024 * 1024))
+    PRODUCT_IMPORT_CHUNK_SIZE = int(os.environ.get('PRODUCT_IMPORT_CHUNK_SIZE', 1000))
+
+    # Serve /api/orders/stats from daily_order_rollups (run `flask backfill-order-rollups` first)
+    ORDER_STATS_USE_ROLLUPS = os.environ.get('ORDER_STATS_USE_ROLLUPS', 'true').lower() == 'true'
+
+    # Seconds an order awaiting M-Pesa confirmation keeps its stock before `flask release-expired-holds` returns it
+    INVENTORY_HOLD_TTL = int(os.environ.get('INVENTORY_HOLD_TTL', 900))
+
+    # Guest cart storage: 'sql' (carts table) or 'kv' (CART_STORE_URL: redis://... or memory:// for local runs)
+    CART_STORE = os.environ.get('CART_STORE', 'sql')
+    CART_STORE_URL = os.environ.get('CART_STORE_URL', 'memory://')
+    # Seconds a guest cart may sit idle: kv entries expire, `flask sweep-guest-carts` deletes carts rows
+    GUEST_CART_TTL = int(os.environ.get('GUEST_CART_TTL', 30 * 24 * 60 * 60))
+
+    # gzip/brotli for JSON responses; compressed listing bodies are cached by ETag
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+    COMPRESSION_CACHE_MAX_BYTES = int(os.environ.get('COMPRESSION_CACHE_MAX_BYTES', 32 * 1024 * 1024))
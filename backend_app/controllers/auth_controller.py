@@ -4,8 +4,9 @@ from backend_app.models.user import User
 from backend_app.models.brand import Brand
 from backend_app.controllers.user_controller import UserController
 from backend_app.services.auth_service import AuthService
-from backend_app.utils.jwt_helper import get_jwt_identity, generate_token
-import requests
+from backend_app.utils.jwt_helper import get_jwt_identity, generate_token, claims_for_user
+from backend_app.utils import http_client
+from backend_app.utils.discovery_cache import DiscoveryDocumentCache
 from oauthlib.oauth2 import WebApplicationClient
 import os
 import json
@@ -22,6 +23,7 @@ class AuthController:
     GOOGLE_CLIENT_ID = os.environ.get("GOOGLE_CLIENT_ID", "your-google-client-id")
     GOOGLE_CLIENT_SECRET = os.environ.get("GOOGLE_CLIENT_SECRET", "your-google-client-secret")
     GOOGLE_DISCOVERY_URL = "https://accounts.google.com/.well-known/openid-configuration"
+    google_discovery = DiscoveryDocumentCache(GOOGLE_DISCOVERY_URL)
 
     client = WebApplicationClient(GOOGLE_CLIENT_ID)
 
@@ -93,7 +95,7 @@ class AuthController:
         Redirects the user to Google's OAuth consent screen.
         Optionally accepts ?redirect_to=<frontend URL> to send user after login.
         """
-        google_provider_cfg = requests.get(AuthController.GOOGLE_DISCOVERY_URL).json()
+        google_provider_cfg = AuthController.google_discovery.get()
         authorization_endpoint = google_provider_cfg["authorization_endpoint"]
 
         redirect_uri = url_for("auth.google_callback", _external=True)
@@ -116,7 +118,7 @@ class AuthController:
                 return {"error": "Authorization code missing"}, 400
 
             # Fetch Google endpoints
-            google_provider_cfg = requests.get(AuthController.GOOGLE_DISCOVERY_URL).json()
+            google_provider_cfg = AuthController.google_discovery.get()
             token_endpoint = google_provider_cfg["token_endpoint"]
             userinfo_endpoint = google_provider_cfg["userinfo_endpoint"]
 
@@ -132,7 +134,7 @@ class AuthController:
                 "grant_type": "authorization_code",
             }
             token_headers = {"Content-Type": "application/x-www-form-urlencoded"}
-            token_response = requests.post(token_endpoint, data=token_data, headers=token_headers)
+            token_response = http_client.post(token_endpoint, data=token_data, headers=token_headers)
             if token_response.status_code != 200:
                 return {"error": "Failed to exchange code for token", "details": token_response.json()}, 400
 
@@ -142,7 +144,7 @@ class AuthController:
                 return {"error": "No access_token received", "details": tokens}, 400
 
             # Fetch user info
-            userinfo_response = requests.get(userinfo_endpoint, headers={"Authorization": f"Bearer {access_token}"})
+            userinfo_response = http_client.get(userinfo_endpoint, headers={"Authorization": f"Bearer {access_token}"})
             if userinfo_response.status_code != 200:
                 return {"error": "Failed to get user info", "details": userinfo_response.text}, 400
 
@@ -167,7 +169,7 @@ class AuthController:
 
             # Generate JWT - IMPORTANT: Convert user.id to string
             user_id_str = str(user.id)
-            token = generate_token(user_id_str)
+            token = generate_token(user_id_str, claims_for_user(user))
 
             # ✅ CRITICAL FIX: Use query parameters instead of hash fragment
             # This works better with Vercel/React Router
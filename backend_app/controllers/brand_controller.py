@@ -3,6 +3,8 @@ from flask import request, jsonify
 from backend_app.extensions import db
 from backend_app.models.brand import Brand
 from backend_app.services.brand_service import BrandService
+from backend_app.utils.streaming import stream_json_array
+from backend_app.utils.fieldsets import BRAND_FIELDS, InvalidFields
 
 
 class BrandController:
@@ -10,8 +12,26 @@ class BrandController:
     def get_all_brands():
         """Get all brands, optionally filtered by category"""
         category = request.args.get('category')
-        brands = BrandService.get_brands_by_category(category) if category else BrandService.get_all_brands()
-        return jsonify([brand.to_dict() for brand in brands])
+        try:
+            fields = BRAND_FIELDS.parse(request.args.get('fields'))
+        except InvalidFields as e:
+            return jsonify({'error': str(e)}), 400
+
+        brands = BrandService.brand_listing_query(category)
+
+        # products_count comes from the listing query, not from the Brand row
+        with_count = fields is None or 'products_count' in fields
+        brand_fields = [name for name in fields or BRAND_FIELDS.default_fields if name != 'products_count']
+        brands = BRAND_FIELDS.load_only(brands, None if fields is None else brand_fields)
+        serialize_brand = BRAND_FIELDS.serializer(brand_fields)
+
+        def serialize(row):
+            data = serialize_brand(row.Brand)
+            if with_count:
+                data['products_count'] = row[1]
+            return data
+
+        return stream_json_array(brands, serialize)
 
     @staticmethod
     def get_brand(brand_id):
@@ -1,19 +1,38 @@
-from flask import request, jsonify
+from flask import current_app, request, jsonify
 from backend_app.services.cart_service import CartService
+import os
+import uuid
 
 
 class CartController:
 
     @staticmethod
-    def get_cart(current_user=None):
+    def _cart_payload(store, cart):
+        """The full cart, or only its counters with ?view=summary (badge refreshes)"""
+        if request.args.get('view') == 'summary':
+            return store.summary(cart)
+        return store.serialize(cart)
+
+    @staticmethod
+    def _session_id(current_user=None):
+        """The guest session from the cookie or X-Session-Id; new guests get a fresh one"""
         session_id = request.cookies.get('session_id') or request.headers.get('X-Session-Id')
+        if not session_id and not current_user:
+            session_id = uuid.uuid4().hex
+        return session_id
+
+    @staticmethod
+    def get_cart(current_user=None):
+        session_id = CartController._session_id(current_user)
+        store = CartService.cart_store(current_user)
 
-        cart = CartService.get_or_create_cart(
+        # A visitor without a cart sees an empty one; nothing is stored until they add to it
+        cart = store.read(
             user_id=current_user.id if current_user else None,
             session_id=session_id
         )
 
-        response = jsonify(cart.to_dict())
+        response = jsonify(CartController._cart_payload(store, cart))
 
         # Set session cookie for guest users
         if not current_user and cart.session_id:
@@ -34,14 +53,15 @@ class CartController:
         if not data or 'product_id' not in data:
             return jsonify({'error': 'Product ID is required'}), 400
 
-        session_id = request.cookies.get('session_id') or request.headers.get('X-Session-Id')
+        session_id = CartController._session_id(current_user)
+        store = CartService.cart_store(current_user)
 
-        cart = CartService.get_or_create_cart(
+        cart = store.get_or_new(
             user_id=current_user.id if current_user else None,
             session_id=session_id
         )
 
-        cart, message = CartService.add_to_cart(
+        cart, message = store.add_item(
             cart,
             data['product_id'],
             data.get('quantity', 1),
@@ -52,7 +72,7 @@ class CartController:
         if not cart:
             return jsonify({'error': message}), 400
 
-        response = jsonify({'message': message, 'cart': cart.to_dict()})
+        response = jsonify({'message': message, 'cart': CartController._cart_payload(store, cart)})
 
         # Set guest session cookie if needed
         if not current_user and cart.session_id:
@@ -74,37 +94,39 @@ class CartController:
         if quantity is None:
             return jsonify({'error': 'Quantity is required'}), 400
 
-        cart, message = CartService.update_cart_item(item_id, quantity)
+        store = CartService.cart_store(current_user)
+        cart, message = store.update_item(item_id, quantity, session_id=CartController._session_id(current_user))
         if not cart:
             return jsonify({'error': message}), 400
 
-        return jsonify({'message': message, 'cart': cart.to_dict()}), 200
+        return jsonify({'message': message, 'cart': CartController._cart_payload(store, cart)}), 200
 
     @staticmethod
     def remove_from_cart(current_user, item_id):
-        cart, message = CartService.remove_from_cart(item_id)
+        store = CartService.cart_store(current_user)
+        cart, message = store.remove_item(item_id, session_id=CartController._session_id(current_user))
         if not cart:
             return jsonify({'error': message}), 400
 
-        return jsonify({'message': message, 'cart': cart.to_dict()}), 200
+        return jsonify({'message': message, 'cart': CartController._cart_payload(store, cart)}), 200
 
     @staticmethod
     def clear_cart(current_user):
         session_id = request.cookies.get('session_id') or request.headers.get('X-Session-Id')
-        cart = None
+        store = CartService.cart_store(current_user)
 
         if current_user:
-            cart, message = CartService.clear_cart(current_user.cart.id)
+            cart = store.get(user_id=current_user.id)
         elif session_id:
-            guest_cart = CartService.get_cart_by_session_id(session_id)
-            if guest_cart:
-                cart, message = CartService.clear_cart(guest_cart.id)
-            else:
-                return jsonify({'error': 'Cart not found'}), 404
+            cart = store.get(session_id=session_id)
         else:
+            cart = None
+
+        if not cart:
             return jsonify({'error': 'Cart not found'}), 404
 
-        return jsonify({'message': message, 'cart': cart.to_dict() if cart else None}), 200
+        cart, message = store.clear(cart)
+        return jsonify({'message': message, 'cart': CartController._cart_payload(store, cart) if cart else None}), 200
 
     @staticmethod
     def merge_carts(current_user):
@@ -116,10 +138,22 @@ class CartController:
         if not session_id:
             return jsonify({'message': 'No guest cart to merge'}), 200
 
-        guest_cart = CartService.get_cart_by_session_id(session_id)
+        guest_store = CartService.cart_store()
+        guest_cart = guest_store.get(session_id=session_id)
         if not guest_cart:
             return jsonify({'message': 'No guest cart to merge'}), 200
 
-        cart, message = CartService.merge_carts(guest_cart.id, current_user.id)
+        # Guest lines land in the user's SQL cart, whichever store held them
+        cart, message = guest_store.merge_into(guest_cart, current_user.id)
+        user_store = CartService.cart_store(current_user)
 
-        return jsonify({'message': message, 'cart': cart.to_dict() if cart else None}), 200
+        return jsonify({'message': message, 'cart': CartController._cart_payload(user_store, cart) if cart else None}), 200
+
+    @staticmethod
+    def get_store_stats(current_user):
+        """Lazy cart creation counters; each worker process keeps its own"""
+        stores = current_app.extensions['cart_stores']
+        return jsonify({
+            'process_id': os.getpid(),
+            'stores': {name: store.stats() for name, store in stores.items()}
+        }), 200
@@ -5,6 +5,7 @@ from backend_app.models.cart import Cart, CartItem
 from backend_app.models.product import Product
 from backend_app.services.order_service import OrderService
 from backend_app.services.payment_service import PaymentService
+from backend_app.utils.fieldsets import ORDER_FIELDS, InvalidFields
 from datetime import datetime
 import logging
 
@@ -22,11 +23,16 @@ class OrderController:
             offset = request.args.get('offset', 0, type=int)
             search = request.args.get('search')
 
+            try:
+                fields = ORDER_FIELDS.parse(request.args.get('fields'))
+            except InvalidFields as e:
+                return jsonify({'error': str(e)}), 400
+
             # For regular users, only show their own orders
             if current_user.role == 'customer':
-                result = OrderService.get_user_orders(current_user.id, limit, offset)
+                result = OrderService.get_user_orders(current_user.id, limit, offset, fields=fields)
                 return jsonify({
-                    'orders': [order.to_dict(include_items=True) for order in result['orders']],
+                    'orders': OrderService.serialize_orders(result['orders'], include_items=True, fields=fields),
                     'total': result['total'],
                     'limit': result['limit'],
                     'offset': result['offset']
@@ -38,10 +44,11 @@ class OrderController:
                     brand_id=current_user.brand_id,
                     status=status,
                     limit=limit,
-                    offset=offset
+                    offset=offset,
+                    fields=fields
                 )
                 return jsonify({
-                    'orders': [order.to_dict(include_items=True) for order in result['orders']],
+                    'orders': OrderService.serialize_orders(result['orders'], include_items=True, fields=fields),
                     'total': result['total'],
                     'limit': result['limit'],
                     'offset': result['offset']
@@ -52,10 +59,11 @@ class OrderController:
                 result = OrderService.get_all_orders(
                     status=status,
                     limit=limit,
-                    offset=offset
+                    offset=offset,
+                    fields=fields
                 )
                 return jsonify({
-                    'orders': [order.to_dict(include_items=True) for order in result['orders']],
+                    'orders': OrderService.serialize_orders(result['orders'], include_items=True, fields=fields),
                     'total': result['total'],
                     'limit': result['limit'],
                     'offset': result['offset']
@@ -325,7 +333,8 @@ class OrderController:
                 user_id=user_id,
                 brand_id=brand_id,
                 start_date=start_date,
-                end_date=end_date
+                end_date=end_date,
+                use_rollups=current_app.config['ORDER_STATS_USE_ROLLUPS']
             )
 
             return jsonify(stats), 200
@@ -342,13 +351,18 @@ class OrderController:
             if not search_term:
                 return jsonify({'error': 'Missing search term'}), 400
 
+            try:
+                fields = ORDER_FIELDS.parse(request.args.get('fields'))
+            except InvalidFields as e:
+                return jsonify({'error': str(e)}), 400
+
             brand_id = current_user.brand_id if current_user.role in ['brand_admin', 'brand_staff'] else None
             user_id = current_user.id if current_user.role == 'customer' else None
 
-            orders = OrderService.search_orders(search_term, user_id=user_id, brand_id=brand_id)
+            orders = OrderService.search_orders(search_term, user_id=user_id, brand_id=brand_id, fields=fields)
 
             return jsonify({
-                'orders': [order.to_dict(include_items=True) for order in orders],
+                'orders': OrderService.serialize_orders(orders, include_items=True, fields=fields),
                 'total': len(orders)
             }), 200
 
@@ -1,12 +1,14 @@
 from flask import request, jsonify
 from backend_app.extensions import db
-from backend_app.models.payment import Payment
 from backend_app.models.order import Order
 from backend_app.services.payment_service import PaymentService
+from backend_app.services.order_rollup_service import OrderRollupService
 from backend_app.utils.jwt_helper import get_current_user, get_current_user_id
+from backend_app.utils.token_cache import mpesa_token_cache
 from datetime import datetime
 import logging
 import json
+import os
 
 logger = logging.getLogger(__name__)
 
@@ -247,8 +249,10 @@ class PaymentController:
             # Update order status
             order = Order.query.get(payment.order_id)
             if order:
+                previous_status = order.status
                 order.status = 'refunded'
                 order.updated_at = datetime.utcnow()
+                OrderRollupService.move_status(order, previous_status, order.status)
 
             db.session.commit()
 
@@ -271,34 +275,43 @@ class PaymentController:
             if not current_user:
                 return jsonify({'error': 'Unauthorized'}), 401
 
-            payment_service = PaymentService()
-
-            if current_user.role == 'customer':
-                user_payments = payment_service.get_user_payments(current_user.id)
-
-                stats = {
-                    'total_payments': user_payments['total'],
-                    'total_amount': sum(p.amount for p in user_payments['payments']),
-                    'successful_payments': sum(1 for p in user_payments['payments'] if p.status == 'completed'),
-                    'pending_payments': sum(1 for p in user_payments['payments'] if p.status == 'pending'),
-                    'failed_payments': sum(1 for p in user_payments['payments'] if p.status == 'failed')
-                }
+            # Optional date window
+            start_date = request.args.get('start_date')
+            end_date = request.args.get('end_date')
+            try:
+                if start_date:
+                    start_date = datetime.fromisoformat(start_date)
+                if end_date:
+                    end_date = datetime.fromisoformat(end_date)
+            except ValueError:
+                return jsonify({'error': 'start_date and end_date must be ISO 8601 dates'}), 400
+
+            # Customers see their own payments, brand staff their brand's,
+            # platform admins everything (optionally narrowed by ?brand_id=)
+            user_id = current_user.id if current_user.role == 'customer' else None
+            if current_user.role in ['brand_admin', 'brand_staff']:
+                brand_id = current_user.brand_id
             else:
-                # For admins, get all payments stats
-                # Note: You might want to implement this differently for performance
-                all_payments = Payment.query.all()
-
-                stats = {
-                    'total_payments': len(all_payments),
-                    'total_amount': sum(p.amount for p in all_payments),
-                    'successful_payments': sum(1 for p in all_payments if p.status == 'completed'),
-                    'pending_payments': sum(1 for p in all_payments if p.status == 'pending'),
-                    'failed_payments': sum(1 for p in all_payments if p.status == 'failed'),
-                    'refunded_payments': sum(1 for p in all_payments if p.status == 'refunded')
-                }
+                brand_id = request.args.get('brand_id', type=int) if user_id is None else None
+
+            payment_service = PaymentService()
+            stats = payment_service.get_payment_stats(
+                user_id=user_id,
+                brand_id=brand_id,
+                start_date=start_date,
+                end_date=end_date
+            )
 
             return jsonify(stats), 200
 
         except Exception as e:
             logger.error(f"Error getting payment stats: {str(e)}")
-            return jsonify({'error': 'Failed to get payment statistics'}), 500
\ No newline at end of file
+            return jsonify({'error': 'Failed to get payment statistics'}), 500
+
+    @staticmethod
+    def get_token_cache_stats(current_user):
+        """Daraja OAuth token cache counters; each worker process keeps its own"""
+        return jsonify({
+            'process_id': os.getpid(),
+            'mpesa': mpesa_token_cache.stats()
+        }), 200
\ No newline at end of file
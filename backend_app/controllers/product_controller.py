@@ -1,15 +1,27 @@
-from flask import request, jsonify
+from flask import request, jsonify, current_app
 from sqlalchemy.orm import joinedload,contains_eager
 from backend_app.extensions import db
+from backend_app.models.brand import Brand
 from backend_app.models.product import Product
+from backend_app.services.inventory_service import StockBelowHeldError
 from backend_app.services.product_service import ProductService
+from backend_app.services.product_import_service import ProductImportService
+from backend_app.services.search_service import SearchService
 from backend_app.utils.brand_filter import brand_filtered_query
+from backend_app.utils.fieldsets import PRODUCT_FIELDS, InvalidFields
+from backend_app.utils.pagination import keyset_paginate, clamp_page_size, InvalidCursor
+from backend_app.utils.streaming import stream_json_array
 
 
 class ProductController:
     @staticmethod
     def get_all_products():
-        """Get all products with optional filtering"""
+        """
+        Get all products with optional filtering.
+        Pass ?cursor= (empty for the first page) to use keyset pagination;
+        the response then carries next_cursor for the following page.
+        ?fields=id,title,price returns (and selects) only those fields.
+        """
         category = request.args.get('category')
         product_type = request.args.get('type')
         style_tag = request.args.get('style')
@@ -17,17 +29,20 @@ class ProductController:
         search = request.args.get('search')
         page = request.args.get('page', type=int)  # optional
         limit = request.args.get('limit', type=int)  # optional
+        cursor = request.args.get('cursor')  # optional, enables cursor mode
+
+        try:
+            fields = PRODUCT_FIELDS.parse(request.args.get('fields'))
+        except InvalidFields as e:
+            return jsonify({'error': str(e)}), 400
 
         # ✅ Brand-filtered query (auto restricts admin by their brand)
         query = brand_filtered_query(Product).filter_by(is_active=True)
 
         # Apply additional filters
         if search:
-            query = query.filter(
-                (Product.title.ilike(f'%{search}%')) |
-                (Product.description.ilike(f'%{search}%')) |
-                (Product.artist.ilike(f'%{search}%'))
-            )
+            # Relevance ordering would break keyset order, so cursor mode only filters
+            query = SearchService.apply_product_search(query, search, ranked=cursor is None)
         if category:
             query = query.filter_by(category=category)
         if product_type:
@@ -38,29 +53,67 @@ class ProductController:
             query = query.filter_by(brand_id=brand_id)
 
         # Ensure brand data is loaded
-        query = query.options(contains_eager(Product.brand))
-
-        # Apply pagination only if page & limit are provided
-        if page and limit:
-            offset = (page - 1) * limit
-            products = query.offset(offset).limit(limit).all()
-        else:
-            products = query.all()  # return all products
+        query = ProductController._with_brand(query, fields)
+        # Keyset cursors are built from created_at, so it is always loaded
+        query = PRODUCT_FIELDS.load_only(query, fields, always=('created_at',))
 
         # Include brand in response
-        products_data = []
-        for product in products:
-            product_dict = product.to_dict()
-            if 'brand' not in product_dict and product.brand:
+        serialize_product = PRODUCT_FIELDS.serializer(fields)
+
+        def serialize(product):
+            product_dict = serialize_product(product)
+            if fields is None and product.brand:
                 product_dict['brand'] = {
                     'id': product.brand.id,
                     'name': product.brand.name,
                     'slug': getattr(product.brand, 'slug', None)
                 }
-            products_data.append(product_dict)
+            return product_dict
+
+        next_cursor = None
+        if cursor is not None:
+            # Keyset pagination: deep pages cost the same as the first one
+            limit = clamp_page_size(
+                limit,
+                current_app.config['PRODUCTS_PAGE_SIZE'],
+                current_app.config['PRODUCTS_MAX_PAGE_SIZE']
+            )
+            try:
+                products, next_cursor = keyset_paginate(query, Product, cursor, limit)
+            except InvalidCursor as e:
+                return jsonify({'error': str(e)}), 400
+        # Apply pagination only if page & limit are provided
+        elif page and limit:
+            offset = (page - 1) * limit
+            products = query.offset(offset).limit(limit).all()
+        else:
+            # Return all products, streamed so big catalogs don't sit in memory
+            return stream_json_array(query, serialize)
+
+        products_data = [serialize(product) for product in products]
+
+        if cursor is not None:
+            return jsonify({
+                'products': products_data,
+                'next_cursor': next_cursor,
+                'limit': limit
+            }), 200
 
         return jsonify(products_data), 200
 
+    @staticmethod
+    def _with_brand(query, fields=None):
+        """Join and eager-load each product's brand, unless ?fields= leaves it out"""
+        if fields is None:
+            return query.outerjoin(Product.brand).options(contains_eager(Product.brand))
+
+        if 'brand' in fields or 'brand_name' in fields:
+            return query.outerjoin(Product.brand).options(
+                contains_eager(Product.brand).load_only(Brand.name, Brand.slug)
+            )
+
+        return query
+
     @staticmethod
     def get_product(product_id):
         """Get a specific product by ID"""
@@ -124,6 +177,46 @@ class ProductController:
 
         return jsonify(product.to_dict()), 201
 
+    @staticmethod
+    def import_products(current_user):
+        """
+        Bulk-create products from CSV or JSON Lines (admin/super_admin only).
+        Send the file as multipart field `file` or as the raw request body;
+        ?format=csv|jsonl overrides detection from the file name/Content-Type.
+        """
+        # Catalog files are larger than the app-wide upload limit
+        request.max_content_length = current_app.config['PRODUCT_IMPORT_MAX_BYTES']
+
+        # ✅ Enforce brand rules: admins import into their own brand,
+        # super_admins pass ?brand_id= or a brand_id column
+        if current_user.role == 'admin':
+            brand_id, allow_row_brand = current_user.brand_id, False
+        elif current_user.role == 'super_admin':
+            brand_id, allow_row_brand = request.args.get('brand_id', type=int), True
+        else:
+            return jsonify({'error': 'Unauthorized role'}), 403
+
+        if request.mimetype == 'multipart/form-data':
+            upload = request.files.get('file')
+            if not upload:
+                return jsonify({'error': 'No file provided'}), 400
+            stream, filename, mimetype = upload.stream, upload.filename, upload.mimetype
+        else:
+            stream, filename, mimetype = request.stream, None, request.mimetype
+
+        fmt = request.args.get('format') or ProductImportService.detect_format(filename, mimetype)
+        if fmt not in ('csv', 'jsonl'):
+            return jsonify({'error': "Unknown file format: pass ?format=csv or ?format=jsonl"}), 400
+
+        report = ProductImportService.import_products(
+            stream, fmt,
+            brand_id=brand_id,
+            allow_row_brand=allow_row_brand,
+            chunk_size=current_app.config['PRODUCT_IMPORT_CHUNK_SIZE']
+        )
+
+        return jsonify(report), 201 if report['created'] else 400
+
     @staticmethod
     def update_product(current_user, product_id):
         """Update a product (admin/super_admin only)"""
@@ -177,13 +270,37 @@ class ProductController:
         elif current_user.role not in ['admin', 'super_admin']:
             return jsonify({'error': 'Unauthorized role'}), 403
 
-        updated_product = ProductService.update_stock(current_user,product_id, data['stock_quantity'])
+        try:
+            updated_product = ProductService.update_stock(current_user,product_id, data['stock_quantity'])
+        except StockBelowHeldError as e:
+            return jsonify({'error': str(e), 'held': e.held}), 400
         return jsonify(updated_product.to_dict()), 200
 
+    @staticmethod
+    def bulk_update_stock(current_user):
+        """
+        Set stock for many products at once (admin/super_admin only).
+        Body: {"updates": [{"product_id": 1, "stock_quantity": 5}, ...]} or the bare list.
+        """
+        data = request.get_json(silent=True)
+        updates = data.get('updates') if isinstance(data, dict) else data
+
+        if not isinstance(updates, list):
+            return jsonify({'error': 'updates must be a list'}), 400
+
+        # ✅ Brand-level restriction is checked in the service, with one ownership lookup for the
+        # whole set; other brands' products are skipped and reported in forbidden_ids
+        report = ProductService.bulk_update_stock(current_user, updates)
+        return jsonify(report), 200
+
     @staticmethod
     def get_products_by_brand(brand_id):
-        products = Product.query.filter_by(brand_id=brand_id).all()
+        try:
+            fields = PRODUCT_FIELDS.parse(request.args.get('fields'))
+        except InvalidFields as e:
+            return jsonify({'error': str(e)}), 400
+
+        products = ProductController._with_brand(Product.query.filter_by(brand_id=brand_id), fields)
 
-        return jsonify([
-            product.to_dict() for product in products
-        ]), 200
+        products = PRODUCT_FIELDS.load_only(products, fields)
+        return stream_json_array(products, PRODUCT_FIELDS.serializer(fields))
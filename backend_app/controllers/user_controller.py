@@ -7,6 +7,10 @@ from backend_app.models.brand import Brand
 from backend_app.services.user_service import UserService
 from backend_app.utils.password_helper import hash_password
 from backend_app.utils.brand_helper import get_current_brand
+from backend_app.utils.jwt_helper import revoke_user_tokens
+from backend_app.utils.streaming import stream_json_array
+from backend_app.utils.fieldsets import USER_FIELDS, InvalidFields
+from sqlalchemy.orm import contains_eager
 import os
 import uuid
 
@@ -74,8 +78,15 @@ class UserController:
         elif current_user.role == "customer":
             return jsonify({"error": "Access denied for customers"}), 403
 
-        users = query.all()
-        return jsonify([u.to_dict() for u in users]), 200
+        try:
+            fields = USER_FIELDS.parse(request.args.get("fields"))
+        except InvalidFields as e:
+            return jsonify({"error": str(e)}), 400
+
+        users = query.outerjoin(User.brand).options(contains_eager(User.brand))
+
+        users = USER_FIELDS.load_only(users, fields)
+        return stream_json_array(users, USER_FIELDS.serializer(fields))
 
     # 🔹 Brand-aware get_user
     @staticmethod
@@ -109,6 +120,10 @@ class UserController:
         # Update allowed fields
         allowed_fields = ["name", "email", "preferences", "role", "bio", "location", "website", "phone"]
 
+        if "role" in data and data["role"] != user.role:
+            # Outstanding tokens carry the old role claim
+            revoke_user_tokens(user)
+
         for key, value in data.items():
             if key in allowed_fields:
                 setattr(user, key, value)
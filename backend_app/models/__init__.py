@@ -4,5 +4,8 @@ from backend_app.models.order import Order
 from backend_app.models.payment import Payment
 from backend_app.models.theme import Theme
 from backend_app.models.cart import Cart
+from backend_app.models.order_rollup import DailyOrderRollup
+from backend_app.models.inventory_hold import InventoryHold
+from backend_app.models.table_version import TableVersion
 
-__all__ = ['User', 'Order', 'Payment', 'Theme', 'Cart']
\ No newline at end of file
+__all__ = ['User', 'Order', 'Payment', 'Theme', 'Cart', 'DailyOrderRollup', 'InventoryHold', 'TableVersion']
\ No newline at end of file
@@ -0,0 +1,30 @@
+# backend_app/models/inventory_hold.py
+from backend_app.extensions import db
+from datetime import datetime
+
+
+class InventoryHold(db.Model):
+    """
+    Stock set aside for an order awaiting M-Pesa confirmation. The units are
+    already taken out of products.stock_quantity; the hold only records until
+    when, so the sweeper can hand them back if payment never arrives.
+    """
+    __tablename__ = 'inventory_holds'
+
+    id = db.Column(db.Integer, primary_key=True)
+    order_id = db.Column(db.Integer, db.ForeignKey('orders.id', ondelete='CASCADE'), nullable=False, index=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id', ondelete='CASCADE'), nullable=False)
+    quantity = db.Column(db.Integer, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    order = db.relationship('Order')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'order_id': self.order_id,
+            'product_id': self.product_id,
+            'quantity': self.quantity,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None
+        }
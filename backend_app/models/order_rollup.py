@@ -0,0 +1,30 @@
+# backend_app/models/order_rollup.py
+from backend_app.extensions import db
+from datetime import datetime
+
+
+class DailyOrderRollup(db.Model):
+    """Pre-aggregated order totals per brand, day and status for dashboards"""
+    __tablename__ = 'daily_order_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('brand_id', 'day', 'status', name='uq_daily_order_rollups_bucket'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    brand_id = db.Column(db.Integer, db.ForeignKey('brands.id'), nullable=False)
+    day = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(50), nullable=False)
+    order_count = db.Column(db.Integer, default=0, nullable=False)
+    revenue = db.Column(db.Float, default=0.0, nullable=False)
+    items_sold = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'brand_id': self.brand_id,
+            'day': self.day.isoformat() if self.day else None,
+            'status': self.status,
+            'order_count': self.order_count,
+            'revenue': self.revenue,
+            'items_sold': self.items_sold
+        }
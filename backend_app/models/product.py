@@ -1,9 +1,14 @@
 # backend_app/models/product.py
+from sqlalchemy import DDL, event
 from backend_app.extensions import db
 
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        # Backs keyset (cursor) pagination of the catalog, newest first
+        db.Index('ix_products_created_at_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -57,4 +62,22 @@ class Product(db.Model):
             'brand_name': self.brand.name if self.brand else None,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'is_active': self.is_active
-        }
\ No newline at end of file
+        }
+
+
+# Full-text search vector, maintained by Postgres itself as a generated column.
+# It is deliberately not mapped on the model: only SearchService reads it, and
+# other databases (SQLite in local runs) fall back to ILIKE matching.
+PRODUCT_SEARCH_VECTOR_DDL = DDL(
+    "ALTER TABLE products ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(artist, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ") STORED"
+)
+PRODUCT_SEARCH_INDEX_DDL = DDL(
+    "CREATE INDEX ix_products_search_vector ON products USING GIN (search_vector)"
+)
+
+event.listen(Product.__table__, 'after_create', PRODUCT_SEARCH_VECTOR_DDL.execute_if(dialect='postgresql'))
+event.listen(Product.__table__, 'after_create', PRODUCT_SEARCH_INDEX_DDL.execute_if(dialect='postgresql'))
@@ -0,0 +1,65 @@
+# backend_app/models/table_version.py
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import Session
+from backend_app.extensions import db
+
+# Tables whose listings are served with conditional GETs (utils/conditional)
+VERSIONED_TABLES = ('brands', 'products', 'themes')
+
+
+class TableVersion(db.Model):
+    """
+    A counter per listed table, bumped in the same transaction as every ORM
+    write to it. Readers validate listings with one primary-key lookup
+    instead of scanning the tables, and a delete changes the version just
+    like an insert or an update does. Raw SQL writes bypass the ORM and do
+    not bump it.
+    """
+    __tablename__ = 'table_versions'
+
+    table_name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+
+TABLE_VERSIONS_SEED_DDL = DDL(
+    "INSERT INTO table_versions (table_name, version) VALUES "
+    + ", ".join(f"('{name}', 0)" for name in VERSIONED_TABLES)
+)
+
+event.listen(TableVersion.__table__, 'after_create', TABLE_VERSIONS_SEED_DDL)
+
+
+def bump_table_versions(session, tables):
+    tables = sorted(set(tables) & set(VERSIONED_TABLES))
+    if tables:
+        # Core statement on the flush's connection: no ORM events, no autoflush
+        session.connection().execute(
+            TableVersion.__table__.update()
+            .where(TableVersion.table_name.in_(tables))
+            .values(version=TableVersion.version + 1)
+        )
+
+
+@event.listens_for(Session, 'after_flush')
+def _bump_after_flush(session, flush_context):
+    # new/dirty/deleted still describe what this flush wrote
+    bump_table_versions(session, {
+        instance.__table__.name
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        if instance not in session.dirty or session.is_modified(instance)
+    })
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _bump_after_bulk_write(orm_execute_state):
+    # update(Product), insert(Product) and Query.update()/delete() skip the flush
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+
+    table = orm_execute_state.statement.table
+    if table.name not in VERSIONED_TABLES:
+        return None
+
+    result = orm_execute_state.invoke_statement()
+    bump_table_versions(orm_execute_state.session, {table.name})
+    return result
@@ -12,6 +12,8 @@ class User(db.Model):
     role = db.Column(db.String(20), default='customer')
     preferences = db.Column(db.JSON, default={})
     created_at = db.Column(db.DateTime, default=db.func.current_timestamp())
+    # Bumped to revoke every JWT issued to this user (see jwt_helper.revoke_user_tokens)
+    token_version = db.Column(db.Integer, default=0, server_default='0', nullable=False)
 
     # New profile fields
     bio = db.Column(db.Text)
@@ -1,12 +1,16 @@
 # backend_app/routes/brand_routes.py
 from flask import Blueprint
 from backend_app.controllers.brand_controller import BrandController
+from backend_app.models.brand import Brand
+from backend_app.models.product import Product
+from backend_app.utils.conditional import conditional
 from backend_app.utils.jwt_helper import token_required, admin_required
 from backend_app.utils.role_required import role_required
 
 brand_bp = Blueprint('brand', __name__)
 
 @brand_bp.route('', methods=['GET'])
+@conditional(Brand, Product)
 def get_all_brands():
     return BrandController.get_all_brands()
 
@@ -1,6 +1,7 @@
 from flask import Blueprint
 from backend_app.controllers.cart_controller import CartController
 from backend_app.utils.jwt_helper import cart_token_optional, token_required
+from backend_app.utils.role_required import role_required
 
 cart_bp = Blueprint('cart', __name__)
 
@@ -45,3 +46,13 @@ def clear_cart(current_user):
 @token_required  # only logged-in users
 def merge_carts(current_user):
     return CartController.merge_carts(current_user)
+
+
+# --------------------------------------
+# Cart store counters (super admin)
+# --------------------------------------
+@cart_bp.route('stats', methods=['GET'])
+@token_required
+@role_required('super_admin')
+def get_cart_store_stats(current_user, *args, **kwargs):
+    return CartController.get_store_stats(current_user)
@@ -1,6 +1,7 @@
 from flask import Blueprint
 from backend_app.controllers.payment_controller import PaymentController
 from backend_app.utils.jwt_helper import token_required
+from backend_app.utils.role_required import role_required
 
 payment_bp = Blueprint('payment', __name__)
 
@@ -19,6 +20,14 @@ def get_payment_stats(current_user):
     return PaymentController.get_payment_stats(current_user)
 
 
+# Daraja token cache counters (super admin)
+@payment_bp.route('/token-cache/stats', methods=['GET'])
+@token_required
+@role_required('super_admin')
+def get_token_cache_stats(current_user, *args, **kwargs):
+    return PaymentController.get_token_cache_stats(current_user)
+
+
 # Get specific payment
 @payment_bp.route('/<int:payment_id>', methods=['GET'])
 @token_required
@@ -1,12 +1,16 @@
 # backend_app/routes/product_routes.py
 from flask import Blueprint
 from backend_app.controllers.product_controller import ProductController
+from backend_app.models.brand import Brand
+from backend_app.models.product import Product
+from backend_app.utils.conditional import conditional
 from backend_app.utils.jwt_helper import token_required, admin_required
 from backend_app.utils.role_required import role_required
 
 product_bp = Blueprint('product', __name__)
 
 @product_bp.route('/', methods=['GET'])
+@conditional(Product, Brand)
 def get_all_products():
     return ProductController.get_all_products()
 
@@ -21,6 +25,12 @@ def get_product(product_id):
 def create_product(current_user, *args, **kwargs):
     return ProductController.create_product(current_user)
 
+@product_bp.route('/import', methods=['POST'])
+@token_required
+@role_required('admin', 'super_admin')
+def import_products(current_user, *args, **kwargs):
+    return ProductController.import_products(current_user)
+
 @product_bp.route('/<int:product_id>', methods=['PUT'])
 @token_required
 # @admin_required
@@ -42,6 +52,13 @@ def delete_product(current_user, product_id):
 def update_stock(current_user, product_id):
     return ProductController.update_stock(current_user,product_id)
 
+@product_bp.route('/stock', methods=['PUT'])
+@token_required
+@role_required('admin', 'super_admin')
+def bulk_update_stock(current_user, *args, **kwargs):
+    return ProductController.bulk_update_stock(current_user)
+
 @product_bp.route('/brand/<int:brand_id>', methods=['GET'])
+@conditional(Product, Brand)
 def get_products_by_brand(brand_id):
     return ProductController.get_products_by_brand(brand_id)
\ No newline at end of file
@@ -1,14 +1,18 @@
 from flask import Blueprint
 from backend_app.controllers.style_controller import StyleController
+from backend_app.models.theme import Theme
+from backend_app.utils.conditional import conditional
 from backend_app.utils.jwt_helper import token_required, admin_required
 
 style_bp = Blueprint('style', __name__)
 
 @style_bp.route('/<style_tag>', methods=['GET'])
+@conditional(Theme)
 def get_theme(style_tag):
     return StyleController.get_theme_by_style_tag(style_tag)
 
 @style_bp.route('/', methods=['GET'])
+@conditional(Theme)
 def get_all_themes():
     return StyleController.get_all_themes()
 
@@ -1,6 +1,7 @@
 from backend_app.extensions import db
 from backend_app.models.user import User
 from backend_app.utils.password_helper import hash_password, verify_password
+from backend_app.utils.jwt_helper import claims_for_user
 from flask_jwt_extended import create_access_token
 
 
@@ -29,7 +30,7 @@ class AuthService:
         # Create access token
         access_token = create_access_token(
             identity=str(user.id),  # Convert user.id to string
-            additional_claims={'is_admin': user.role == 'admin'}
+            additional_claims={'is_admin': user.role == 'admin', **claims_for_user(user)}
         )
 
         return {
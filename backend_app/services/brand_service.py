@@ -1,6 +1,9 @@
 # backend_app/services/brand_service.py
 from backend_app.extensions import db
 from backend_app.models.brand import Brand
+from backend_app.models.product import Product
+from sqlalchemy import func
+from sqlalchemy.orm import noload
 
 class BrandService:
     @staticmethod
@@ -11,6 +14,23 @@ class BrandService:
     def get_brands_by_category(category):
         return Brand.query.filter_by(category=category, is_active=True).all()
 
+    @staticmethod
+    def brand_listing_query(category=None):
+        """Active brands with their product counts as (Brand, products_count) rows"""
+        products_count = (db.session.query(func.count(Product.id))
+                          .filter(Product.brand_id == Brand.id)
+                          .correlate(Brand)
+                          .scalar_subquery())
+        # noload: to_dict() would otherwise load every product just to count them
+        query = (db.session.query(Brand, products_count)
+                 .options(noload(Brand.products))
+                 .filter(Brand.is_active == True))
+
+        if category:
+            query = query.filter(Brand.category == category)
+
+        return query
+
     @staticmethod
     def get_brand_by_id(brand_id):
         return Brand.query.filter_by(id=brand_id, is_active=True).first()
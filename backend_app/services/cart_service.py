@@ -3,6 +3,11 @@
 from backend_app.extensions import db
 from backend_app.models.cart import Cart, CartItem
 from backend_app.models.product import Product
+from backend_app.utils.fieldsets import CART_ITEM_FIELDS
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import case, func, insert, update
+from sqlalchemy.orm import contains_eager
 import uuid
 
 
@@ -23,16 +28,92 @@ class CartService:
         return cart
 
     @staticmethod
-    def get_or_create_cart(user_id=None, session_id=None):
+    def get_cart(user_id=None, session_id=None):
         if user_id:
-            cart = CartService.get_cart_by_user_id(user_id)
-        else:
-            cart = CartService.get_cart_by_session_id(session_id)
+            return CartService.get_cart_by_user_id(user_id)
+        return CartService.get_cart_by_session_id(session_id)
 
-        if not cart:
-            cart = CartService.create_cart(user_id, session_id)
+    @staticmethod
+    def new_cart(user_id=None, session_id=None):
+        """An empty cart that is not added to the session: add_to_cart() saves it with its first line"""
+        return Cart(user_id=user_id, session_id=session_id)
 
-        return cart
+    @staticmethod
+    def cart_store(current_user=None):
+        """
+        Where a cart lives: signed-in users' carts are always rows, since
+        checkout reads them; guest carts follow CART_STORE (see cart_store).
+        """
+        return current_app.extensions['cart_stores']['user' if current_user else 'guest']
+
+    @staticmethod
+    def serialize_cart(cart):
+        """
+        Cart.to_dict() payload from a single query: the cart, its items, their
+        products and the products' brands are joined in, and the totals are
+        summed in the same pass that serializes the items.
+        """
+        if cart.id is None:
+            # Unsaved (see new_cart): there is nothing to load
+            return CartService.cart_payload(cart)
+
+        cart = (Cart.query
+                .outerjoin(Cart.items)
+                .outerjoin(CartItem.product)
+                .outerjoin(Product.brand)
+                .options(contains_eager(Cart.items).contains_eager(CartItem.product).contains_eager(Product.brand))
+                .filter(Cart.id == cart.id)
+                .order_by(CartItem.id)
+                .populate_existing()
+                .one())
+
+        return CartService.cart_payload(cart)
+
+    @staticmethod
+    def cart_payload(cart):
+        """Cart.to_dict() keys for a cart whose items already have their products loaded"""
+        serialize_item = CART_ITEM_FIELDS.serializer()
+        items = []
+        total_items = 0
+        total_amount = 0
+        for item in cart.items:
+            items.append(serialize_item(item))
+            total_items += item.quantity
+            if item.product:
+                total_amount += item.product.price * item.quantity
+
+        return {
+            'id': cart.id,
+            'user_id': cart.user_id,
+            'session_id': cart.session_id,
+            'items': items,
+            'total_items': total_items,
+            'total_amount': total_amount,
+            'created_at': cart.created_at.isoformat() if cart.created_at else None,
+            'updated_at': cart.updated_at.isoformat() if cart.updated_at else None
+        }
+
+    @staticmethod
+    def cart_summary(cart):
+        """Counters for a cart badge, aggregated in SQL without loading any items"""
+        if cart.id is None:
+            return {'id': None, 'items_count': 0, 'total_items': 0, 'total_amount': 0.0}
+
+        lines, total_items, total_amount = (db.session.query(
+                func.count(CartItem.id),
+                func.coalesce(func.sum(CartItem.quantity), 0),
+                func.coalesce(func.sum(CartItem.quantity * Product.price), 0))
+            .select_from(CartItem)
+            .outerjoin(Product, Product.id == CartItem.product_id)
+            .filter(CartItem.cart_id == cart.id)
+            .one())
+
+        return {
+            'id': cart.id,
+            'items_count': lines,
+            'total_items': int(total_items),
+            'total_amount': float(total_amount)
+        }
 
     @staticmethod
     def add_to_cart(cart, product_id, quantity=1, size=None, color=None):
@@ -43,6 +124,11 @@ class CartService:
         if product.stock_quantity < quantity:
             return None, f'Only {product.stock_quantity} items available'
 
+        if cart.id is None:
+            # First line of a cart so far only read: the row is written now, in the same commit
+            db.session.add(cart)
+            db.session.flush()
+
         # Check if item already exists in cart
         existing_item = CartItem.query.filter_by(
             cart_id=cart.id,
@@ -110,6 +196,14 @@ class CartService:
 
     @staticmethod
     def merge_carts(guest_cart_id, user_id):
+        """
+        Fold a guest cart into the user's cart in a fixed number of queries,
+        however many lines it has: both carts' lines come from one query,
+        keyed by (product_id, size, color), and stock for every product
+        involved from another. Lines the user already has are raised (capped
+        at stock) in one UPDATE, the rest move over in a second, then the
+        guest cart is deleted.
+        """
         guest_cart = Cart.query.get(guest_cart_id)
         if not guest_cart:
             return None, 'Guest cart not found'
@@ -118,24 +212,113 @@ class CartService:
         if not user_cart:
             user_cart = CartService.create_cart(user_id=user_id)
 
-        for guest_item in guest_cart.items:
-            existing_item = CartItem.query.filter_by(
-                cart_id=user_cart.id,
-                product_id=guest_item.product_id,
-                size=guest_item.size,
-                color=guest_item.color
-            ).first()
-
-            if existing_item:
-                new_quantity = existing_item.quantity + guest_item.quantity
-                if new_quantity <= guest_item.product.stock_quantity:
-                    existing_item.quantity = new_quantity
-                else:
-                    existing_item.quantity = guest_item.product.stock_quantity
-            else:
-                guest_item.cart_id = user_cart.id
+        if user_cart.id == guest_cart.id:
+            # The session already belongs to the user's own cart
+            return user_cart, 'Carts merged successfully'
+
+        lines = CartItem.query.filter(CartItem.cart_id.in_([guest_cart.id, user_cart.id])).all()
+        user_lines = {(line.product_id, line.size, line.color): line
+                      for line in lines if line.cart_id == user_cart.id}
+        guest_lines = [line for line in lines if line.cart_id == guest_cart.id]
 
-        db.session.delete(guest_cart)
+        moved = CartService._raise_matching_lines(user_lines, guest_lines)
+        if moved:
+            db.session.execute(
+                update(CartItem)
+                .where(CartItem.id.in_([line.id for line in moved]))
+                .values(cart_id=user_cart.id)
+                .execution_options(synchronize_session=False)
+            )
+
+        # Set-based deletes: an ORM delete would cascade to lines that just moved
+        CartItem.query.filter(CartItem.cart_id == guest_cart.id).delete(synchronize_session=False)
+        Cart.query.filter(Cart.id == guest_cart.id).delete(synchronize_session=False)
         db.session.commit()
         return user_cart, 'Carts merged successfully'
 
+    @staticmethod
+    def merge_lines(user_id, lines):
+        """
+        Add guest cart lines kept outside the database (see cart_store) to the
+        user's cart: matching lines are raised as in merge_carts and the rest
+        are written in one multi-row INSERT. This is where a key-value guest
+        cart first reaches SQL.
+        """
+        user_cart = CartService.get_cart_by_user_id(user_id)
+        if not user_cart:
+            user_cart = CartService.create_cart(user_id=user_id)
+
+        user_lines = {(line.product_id, line.size, line.color): line
+                      for line in CartItem.query.filter(CartItem.cart_id == user_cart.id)}
+
+        added = CartService._raise_matching_lines(user_lines, lines)
+        if added:
+            db.session.execute(insert(CartItem), [
+                {'cart_id': user_cart.id, 'product_id': line.product_id, 'quantity': line.quantity,
+                 'size': line.size, 'color': line.color}
+                for line in added
+            ])
+
+        db.session.commit()
+        return user_cart, 'Carts merged successfully'
+
+    @staticmethod
+    def _raise_matching_lines(user_lines, guest_lines):
+        """
+        Add guest quantities to the user lines with the same (product_id, size,
+        color), capped at stock, in one UPDATE. Returns the guest lines that
+        matched nothing.
+        """
+        stock = dict(db.session.query(Product.id, Product.stock_quantity)
+                     .filter(Product.id.in_({line.product_id for line in guest_lines})))
+
+        raised = {}
+        unmatched = []
+        for line in guest_lines:
+            existing = user_lines.get((line.product_id, line.size, line.color))
+            if existing:
+                quantity = raised.get(existing.id, existing.quantity) + line.quantity
+                raised[existing.id] = min(quantity, stock.get(line.product_id) or 0)
+            else:
+                unmatched.append(line)
+
+        if raised:
+            db.session.execute(
+                update(CartItem)
+                .where(CartItem.id.in_(list(raised)))
+                .values(quantity=case(raised, value=CartItem.id))
+                .execution_options(synchronize_session=False)
+            )
+
+        return unmatched
+
+    @staticmethod
+    def sweep_guest_carts(ttl, now=None, batch_size=500):
+        """
+        Delete guest carts idle for more than ttl seconds: neither the cart nor
+        any of its lines changed since the cutoff. Works through batch_size
+        carts per transaction (one SELECT of ids, then one DELETE for their
+        lines and one for the carts) so locks stay short. Returns the number
+        of carts deleted.
+        """
+        cutoff = (now or datetime.utcnow()) - timedelta(seconds=ttl)
+        recent_line = (db.session.query(CartItem.id)
+                       .filter(CartItem.cart_id == Cart.id, CartItem.updated_at >= cutoff)
+                       .exists())
+        deleted = 0
+
+        while True:
+            cart_ids = [cart_id for cart_id, in (db.session.query(Cart.id)
+                        .filter(Cart.user_id.is_(None), Cart.updated_at < cutoff, ~recent_line)
+                        .order_by(Cart.id)
+                        .limit(batch_size)
+                        .with_for_update(skip_locked=True))]
+            if not cart_ids:
+                break
+
+            CartItem.query.filter(CartItem.cart_id.in_(cart_ids)).delete(synchronize_session=False)
+            Cart.query.filter(Cart.id.in_(cart_ids)).delete(synchronize_session=False)
+            db.session.commit()
+            deleted += len(cart_ids)
+
+        return deleted
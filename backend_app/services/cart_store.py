@@ -0,0 +1,338 @@
+# backend_app/services/cart_store.py
+import json
+import threading
+import time
+from datetime import datetime
+from sqlalchemy.orm import contains_eager
+from backend_app.extensions import db
+from backend_app.models.product import Product
+from backend_app.services.cart_service import CartService
+
+try:
+    import redis
+except ImportError:  # optional: only needed when CART_STORE_URL is a redis:// URL
+    redis = None
+
+
+def init_cart_store(app):
+    """Set up the cart stores CartService.cart_store() hands out, per CART_STORE"""
+    if app.config['CART_STORE'] == 'kv':
+        guest = KeyValueCartStore(key_value_client(app.config['CART_STORE_URL']), app.config['GUEST_CART_TTL'])
+    elif app.config['CART_STORE'] == 'sql':
+        guest = SqlCartStore()
+    else:
+        raise ValueError(f"Unknown CART_STORE {app.config['CART_STORE']!r}: use 'sql' or 'kv'")
+
+    app.extensions['cart_stores'] = {'user': SqlCartStore(), 'guest': guest}
+
+
+def key_value_client(url):
+    """redis-py client for redis:// URLs, or the in-process stand-in for memory://"""
+    if url.startswith('memory://'):
+        return InMemoryKeyValueClient()
+    if redis is None:
+        raise RuntimeError('CART_STORE_URL points at Redis but the redis package is not installed')
+    return redis.Redis.from_url(url)
+
+
+class CartStore:
+    """
+    Carts are created lazily: a visitor without one gets an unsaved empty
+    cart, and it is only stored along with its first line in add_item().
+    Crawlers and first-time visitors that just look at the cart never write.
+    writes_avoided counts those reads (each used to insert a cart) and
+    carts_created the carts that were stored after all; GET /api/cart/stats
+    reports them for the worker process that answers.
+    """
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.writes_avoided = 0
+        self.carts_created = 0
+
+    def get_or_new(self, user_id=None, session_id=None):
+        """The stored cart, or a new unsaved one for add_item() to store"""
+        cart = self.get(user_id, session_id)
+        return cart if cart is not None else self.new_cart(user_id, session_id)
+
+    def read(self, user_id=None, session_id=None):
+        """get_or_new() for displaying the cart, counting the writes it saves"""
+        cart = self.get(user_id, session_id)
+        if cart is None:
+            self._count('writes_avoided')
+            cart = self.new_cart(user_id, session_id)
+        return cart
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'writes_avoided': self.writes_avoided,
+                'carts_created': self.carts_created
+            }
+
+    def _count(self, name):
+        # Request threads share the store; += on an attribute is not atomic
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+class SqlCartStore(CartStore):
+    """Carts as carts/cart_items rows: always used for users, the default for guests"""
+
+    def get(self, user_id=None, session_id=None):
+        return CartService.get_cart(user_id, session_id)
+
+    def new_cart(self, user_id=None, session_id=None):
+        return CartService.new_cart(user_id, session_id)
+
+    def add_item(self, cart, product_id, quantity=1, size=None, color=None):
+        unsaved = cart.id is None
+        cart, message = CartService.add_to_cart(cart, product_id, quantity, size, color)
+        if cart and unsaved:
+            self._count('carts_created')
+        return cart, message
+
+    def update_item(self, item_id, quantity, session_id=None):
+        return CartService.update_cart_item(item_id, quantity)
+
+    def remove_item(self, item_id, session_id=None):
+        return CartService.remove_from_cart(item_id)
+
+    def clear(self, cart):
+        return CartService.clear_cart(cart.id)
+
+    def serialize(self, cart):
+        return CartService.serialize_cart(cart)
+
+    def summary(self, cart):
+        return CartService.cart_summary(cart)
+
+    def merge_into(self, cart, user_id):
+        """Fold this guest cart into the user's cart; returns (user cart, message)"""
+        return CartService.merge_carts(cart.id, user_id)
+
+
+class GuestCartItem:
+    """A line of a GuestCart, with the CartItem attributes CART_ITEM_FIELDS reads"""
+    cart_id = None
+
+    def __init__(self, id, product_id, quantity, size=None, color=None, created_at=None, updated_at=None):
+        now = datetime.utcnow()
+        self.id = id
+        self.product_id = product_id
+        self.quantity = quantity
+        self.size = size
+        self.color = color
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
+        self.product = None  # loaded when the cart is serialized
+
+
+class GuestCart:
+    """A guest cart kept in a key-value store, shaped like Cart for the API"""
+    id = None
+    user_id = None
+
+    def __init__(self, session_id, items=(), next_item_id=1, created_at=None, updated_at=None, stored=False):
+        now = datetime.utcnow()
+        self.session_id = session_id
+        self.stored = stored
+        self.items = list(items)
+        self.next_item_id = next_item_id
+        self.created_at = created_at or now
+        self.updated_at = updated_at or now
+
+    def find(self, product_id, size, color):
+        return next((item for item in self.items
+                     if (item.product_id, item.size, item.color) == (product_id, size, color)), None)
+
+    def item(self, item_id):
+        return next((item for item in self.items if item.id == item_id), None)
+
+    def add(self, product_id, quantity, size=None, color=None):
+        # Item ids are only unique within the cart, and never reused
+        self.items.append(GuestCartItem(self.next_item_id, product_id, quantity, size, color))
+        self.next_item_id += 1
+
+    def to_json(self):
+        return json.dumps({
+            'session_id': self.session_id,
+            'next_item_id': self.next_item_id,
+            'created_at': self.created_at.isoformat(),
+            'updated_at': self.updated_at.isoformat(),
+            'items': [{
+                'id': item.id,
+                'product_id': item.product_id,
+                'quantity': item.quantity,
+                'size': item.size,
+                'color': item.color,
+                'created_at': item.created_at.isoformat(),
+                'updated_at': item.updated_at.isoformat()
+            } for item in self.items]
+        })
+
+    @classmethod
+    def from_json(cls, raw):
+        data = json.loads(raw)
+        items = [GuestCartItem(
+            item['id'], item['product_id'], item['quantity'], item['size'], item['color'],
+            datetime.fromisoformat(item['created_at']), datetime.fromisoformat(item['updated_at'])
+        ) for item in data['items']]
+
+        return cls(data['session_id'], items, data['next_item_id'],
+                   datetime.fromisoformat(data['created_at']), datetime.fromisoformat(data['updated_at']),
+                   stored=True)
+
+
+class KeyValueCartStore(CartStore):
+    """
+    Guest carts as one JSON document per session in a key-value store: Redis
+    in production, InMemoryKeyValueClient in tests and local runs. Anonymous
+    visits never write to the database; products are still read from it to
+    check stock and render carts, and the lines reach SQL only when the
+    guest signs in and merge_into() runs. Each write restarts the ttl.
+    """
+
+    KEY_PREFIX = 'guest_cart:'
+
+    def __init__(self, client, ttl):
+        super().__init__()
+        self.client = client
+        self.ttl = ttl
+
+    def get(self, user_id=None, session_id=None):
+        raw = self.client.get(self.KEY_PREFIX + session_id) if session_id else None
+        return GuestCart.from_json(raw) if raw is not None else None
+
+    def new_cart(self, user_id=None, session_id=None):
+        return GuestCart(session_id)
+
+    def add_item(self, cart, product_id, quantity=1, size=None, color=None):
+        product = db.session.get(Product, product_id)
+        if not product:
+            return None, 'Product not found'
+
+        if product.stock_quantity < quantity:
+            return None, f'Only {product.stock_quantity} items available'
+
+        existing = cart.find(product_id, size, color)
+        if existing:
+            new_quantity = existing.quantity + quantity
+            if new_quantity > product.stock_quantity:
+                return None, f'Cannot add more than {product.stock_quantity} items'
+            existing.quantity = new_quantity
+            existing.updated_at = datetime.utcnow()
+        else:
+            cart.add(product_id, quantity, size, color)
+
+        self._save(cart)
+        return cart, 'Item added to cart'
+
+    def update_item(self, item_id, quantity, session_id=None):
+        cart = self.get(session_id=session_id)
+        item = cart.item(item_id) if cart else None
+        if not item:
+            return None, 'Cart item not found'
+
+        if quantity <= 0:
+            cart.items.remove(item)
+            self._save(cart)
+            return cart, 'Item removed from cart'
+
+        product = db.session.get(Product, item.product_id)
+        stock = product.stock_quantity if product else 0
+        if quantity > stock:
+            return None, f'Only {stock} items available'
+
+        item.quantity = quantity
+        item.updated_at = datetime.utcnow()
+        self._save(cart)
+        return cart, 'Cart item updated'
+
+    def remove_item(self, item_id, session_id=None):
+        cart = self.get(session_id=session_id)
+        item = cart.item(item_id) if cart else None
+        if not item:
+            return None, 'Cart item not found'
+
+        cart.items.remove(item)
+        self._save(cart)
+        return cart, 'Item removed from cart'
+
+    def clear(self, cart):
+        cart.items = []
+        self._save(cart)
+        return cart, 'Cart cleared'
+
+    def serialize(self, cart):
+        """Same payload as a SQL cart; products and brands come from one query"""
+        product_ids = {item.product_id for item in cart.items}
+        products = {}
+        if product_ids:
+            products = {product.id: product for product in Product.query
+                        .outerjoin(Product.brand)
+                        .options(contains_eager(Product.brand))
+                        .filter(Product.id.in_(product_ids))}
+
+        for item in cart.items:
+            item.product = products.get(item.product_id)
+        return CartService.cart_payload(cart)
+
+    def summary(self, cart):
+        prices = {}
+        if cart.items:
+            prices = dict(db.session.query(Product.id, Product.price)
+                          .filter(Product.id.in_({item.product_id for item in cart.items})))
+
+        return {
+            'id': cart.id,
+            'items_count': len(cart.items),
+            'total_items': sum(item.quantity for item in cart.items),
+            'total_amount': float(sum(prices.get(item.product_id, 0) * item.quantity for item in cart.items))
+        }
+
+    def merge_into(self, cart, user_id):
+        """Write the guest lines into the user's SQL cart, then forget the guest cart"""
+        user_cart, message = CartService.merge_lines(user_id, cart.items)
+        self.client.delete(self.KEY_PREFIX + cart.session_id)
+        return user_cart, message
+
+    def _save(self, cart):
+        if not cart.stored:
+            self._count('carts_created')
+            cart.stored = True
+        cart.updated_at = datetime.utcnow()
+        self.client.set(self.KEY_PREFIX + cart.session_id, cart.to_json(), ex=self.ttl)
+
+
+class InMemoryKeyValueClient:
+    """
+    Dict-backed stand-in for the redis-py calls KeyValueCartStore makes (get,
+    set with ex, delete). Each process has its own copy and expired keys are
+    dropped when read, so it suits tests and local runs, not production.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}  # key -> (value bytes, expires_at on the monotonic clock or None)
+
+    def get(self, name):
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None:
+                return None
+            if entry[1] is not None and entry[1] <= time.monotonic():
+                del self._data[name]
+                return None
+            return entry[0]
+
+    def set(self, name, value, ex=None):
+        if isinstance(value, str):
+            value = value.encode()
+        with self._lock:
+            self._data[name] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            return sum(self._data.pop(name, None) is not None for name in names)
@@ -0,0 +1,229 @@
+# backend_app/services/inventory_service.py
+from backend_app.extensions import db
+from backend_app.models.inventory_hold import InventoryHold
+from backend_app.models.order import Order
+from backend_app.models.product import Product
+from backend_app.services.order_rollup_service import OrderRollupService
+from datetime import datetime, timedelta
+from sqlalchemy import case, func, select, update
+
+HOLD_EXPIRED_REASON = 'Payment not completed before the inventory hold expired'
+
+
+class InsufficientStockError(ValueError):
+    def __init__(self, products):
+        self.product_ids = [product.id for product in products]
+        titles = ', '.join(product.title for product in products)
+        super().__init__(f"Insufficient stock for {titles}")
+
+
+class StockBelowHeldError(ValueError):
+    def __init__(self, product_id, quantity, held):
+        self.product_id = product_id
+        self.held = held
+        super().__init__(f"stock_quantity {quantity} for product {product_id} is below "
+                         f"the {held} units held for unpaid orders")
+
+
+class InventoryService:
+    """
+    Stock changes for checkout, payment and cancellation. Stock moves in one
+    UPDATE for all lines, staged in the caller's transaction: if it raises, the
+    caller's rollback undoes everything, so an order never takes part of its
+    stock. Orders waiting on an asynchronous payment (see hold_for_payment)
+    keep their stock only until the hold expires.
+    """
+
+    @staticmethod
+    def quantities_by_product(lines):
+        """Sum (product_id, quantity) pairs so repeated products count once"""
+        quantities = {}
+        for product_id, quantity in lines:
+            quantities[product_id] = quantities.get(product_id, 0) + quantity
+        return quantities
+
+    @staticmethod
+    def reserve_stock(quantities):
+        """
+        Decrement stock for {product_id: quantity} only where enough is left:
+
+            UPDATE products SET stock_quantity = stock_quantity - CASE id ... END
+            WHERE id IN (...) AND stock_quantity >= CASE id ... END
+
+        The check and the write are one statement, so concurrent checkouts
+        cannot both pass the check on the same units. Raises
+        InsufficientStockError unless every line was covered.
+        """
+        if not quantities:
+            return
+
+        product_ids = sorted(quantities)
+
+        if db.session.get_bind().dialect.name == 'postgresql' and len(product_ids) > 1:
+            # Lock rows in id order so overlapping multi-product checkouts
+            # queue behind each other instead of deadlocking
+            (db.session.query(Product.id)
+             .filter(Product.id.in_(product_ids))
+             .order_by(Product.id)
+             .with_for_update()
+             .all())
+
+        wanted = InventoryService._quantity_case(quantities)
+        reserved = db.session.execute(
+            update(Product)
+            .where(Product.id.in_(product_ids), Product.stock_quantity >= wanted)
+            .values(stock_quantity=Product.stock_quantity - wanted)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+
+        if len(reserved) != len(product_ids):
+            # Only the failure path pays for working out which lines fell short
+            unreserved = set(product_ids) - set(reserved)
+            short = Product.query.filter(Product.id.in_(unreserved)).order_by(Product.id).all()
+            missing = unreserved - {product.id for product in short}
+            if missing:
+                raise ValueError(f"Product not found: {min(missing)}")
+            raise InsufficientStockError(short)
+
+    @staticmethod
+    def release_stock(quantities):
+        """Return {product_id: quantity} to stock (cancelled orders)"""
+        if not quantities:
+            return
+
+        db.session.execute(
+            update(Product)
+            .where(Product.id.in_(list(quantities)))
+            .values(stock_quantity=Product.stock_quantity + InventoryService._quantity_case(quantities))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def held_quantity():
+        """
+        Units of the enclosing statement's product held for unpaid orders, as
+        a correlated subquery. Those units are already out of stock_quantity
+        and go back in if the hold lapses, so a counted on-hand figure has to
+        be stored net of them.
+        """
+        return (select(func.coalesce(func.sum(InventoryHold.quantity), 0))
+                .where(InventoryHold.product_id == Product.id)
+                .scalar_subquery())
+
+    @staticmethod
+    def held_by_product(product_ids):
+        """{product_id: units held for unpaid orders} for the given products"""
+        if not product_ids:
+            return {}
+
+        return dict(db.session.query(InventoryHold.product_id, func.sum(InventoryHold.quantity))
+                    .filter(InventoryHold.product_id.in_(list(product_ids)))
+                    .group_by(InventoryHold.product_id))
+
+    @staticmethod
+    def hold_for_payment(order, ttl):
+        """
+        Put a pending order's stock (taken when the order was created) on a
+        hold that lapses after ttl seconds, for payments a provider confirms
+        later by callback. Unless the payment converts the hold first, the
+        sweeper cancels the order and returns the stock. Starting another
+        payment replaces the hold, so every attempt gets the full ttl.
+        """
+        if order.status != 'pending':
+            return
+
+        InventoryService.drop_holds(order.id)
+        expires_at = datetime.utcnow() + timedelta(seconds=ttl)
+        db.session.add_all([
+            InventoryHold(order_id=order.id, product_id=product_id, quantity=quantity, expires_at=expires_at)
+            for product_id, quantity in InventoryService.quantities_by_product(
+                (item.product_id, item.quantity) for item in order.items
+            ).items()
+        ])
+
+    @staticmethod
+    def convert_holds(order):
+        """
+        Make a paid order's stock permanent by dropping its holds. If the
+        sweeper already released them, try to take the stock again; returns
+        False when it has sold out in the meantime.
+        """
+        # Serialize with the sweeper, which cancels the same order row
+        db.session.refresh(order, with_for_update=True)
+
+        dropped = InventoryService.drop_holds(order.id)
+        if dropped or order.cancellation_reason != HOLD_EXPIRED_REASON:
+            return True
+
+        try:
+            with db.session.begin_nested():
+                InventoryService.reserve_stock(InventoryService.quantities_by_product(
+                    (item.product_id, item.quantity) for item in order.items
+                ))
+        except InsufficientStockError:
+            return False
+
+        order.cancelled_at = None
+        order.cancellation_reason = None
+        return True
+
+    @staticmethod
+    def drop_holds(order_id):
+        """Forget an order's holds without touching stock; returns how many there were"""
+        return (InventoryHold.query
+                .filter(InventoryHold.order_id == order_id)
+                .delete(synchronize_session=False))
+
+    @staticmethod
+    def release_expired_holds(now=None, batch_size=500):
+        """
+        Cancel pending orders whose holds have lapsed and return their stock.
+        Works through batch_size orders per transaction; each batch is one
+        grouped SELECT, one UPDATE and one DELETE however many lines it
+        covers. Returns the number of orders cancelled.
+        """
+        now = now or datetime.utcnow()
+        released = 0
+
+        while True:
+            expired = (db.session.query(InventoryHold.order_id)
+                       .filter(InventoryHold.expires_at <= now)
+                       .distinct()
+                       .subquery())
+            orders = (Order.query
+                      .filter(Order.id.in_(db.session.query(expired.c.order_id)),
+                              Order.status == 'pending')
+                      .order_by(Order.id)
+                      .limit(batch_size)
+                      .with_for_update(skip_locked=True)
+                      .all())
+            if not orders:
+                break
+
+            order_ids = [order.id for order in orders]
+            quantities = dict(
+                db.session.query(InventoryHold.product_id, func.sum(InventoryHold.quantity))
+                .filter(InventoryHold.order_id.in_(order_ids))
+                .group_by(InventoryHold.product_id)
+                .all()
+            )
+            InventoryService.release_stock(quantities)
+            (InventoryHold.query
+             .filter(InventoryHold.order_id.in_(order_ids))
+             .delete(synchronize_session=False))
+
+            for order in orders:
+                order.status = 'cancelled'
+                order.cancelled_at = now
+                order.cancellation_reason = HOLD_EXPIRED_REASON
+                OrderRollupService.move_status(order, 'pending', 'cancelled')
+
+            db.session.commit()
+            released += len(orders)
+
+        return released
+
+    @staticmethod
+    def _quantity_case(quantities):
+        return case(quantities, value=Product.id, else_=0)
@@ -0,0 +1,128 @@
+# backend_app/services/order_rollup_service.py
+from backend_app.extensions import db
+from backend_app.models.order import Order, OrderItem
+from backend_app.models.order_rollup import DailyOrderRollup
+from backend_app.models.user import User
+from datetime import datetime
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+class OrderRollupService:
+    """
+    Keeps daily_order_rollups in step with orders. Every call only stages
+    changes in the current session; the caller's commit makes them durable
+    together with the order itself.
+    """
+
+    @staticmethod
+    def record_order(order):
+        """Count a newly created (and flushed) order in its day/status bucket"""
+        OrderRollupService._bump(order, order.status, 1)
+
+    @staticmethod
+    def move_status(order, old_status, new_status):
+        """Move an order between status buckets after its status changed"""
+        if old_status == new_status:
+            return
+        OrderRollupService._bump(order, old_status, -1)
+        OrderRollupService._bump(order, new_status, 1)
+
+    @staticmethod
+    def status_totals(brand_id=None, start_date=None, end_date=None):
+        """(status, order_count, revenue) rows summed over the requested days"""
+        query = db.session.query(
+            DailyOrderRollup.status,
+            func.sum(DailyOrderRollup.order_count),
+            func.coalesce(func.sum(DailyOrderRollup.revenue), 0)
+        )
+
+        if brand_id:
+            query = query.filter(DailyOrderRollup.brand_id == brand_id)
+
+        if start_date:
+            query = query.filter(DailyOrderRollup.day >= start_date.date())
+
+        if end_date:
+            query = query.filter(DailyOrderRollup.day <= end_date.date())
+
+        return query.group_by(DailyOrderRollup.status).all()
+
+    @staticmethod
+    def rebuild():
+        """Recompute every rollup row from the orders table (backfill)"""
+        items = (db.session.query(OrderItem.order_id, func.sum(OrderItem.quantity).label('quantity'))
+                 .group_by(OrderItem.order_id)
+                 .subquery())
+
+        day = func.date(Order.created_at)
+        status = func.coalesce(Order.status, 'pending')
+        source = (db.session.query(
+                      User.brand_id,
+                      day,
+                      status,
+                      func.count(Order.id),
+                      func.coalesce(func.sum(Order.total_amount), 0),
+                      func.coalesce(func.sum(items.c.quantity), 0),
+                      func.current_timestamp()
+                  )
+                  .join(User, Order.user_id == User.id)
+                  .outerjoin(items, items.c.order_id == Order.id)
+                  .group_by(User.brand_id, day, status))
+
+        try:
+            db.session.query(DailyOrderRollup).delete()
+            db.session.execute(insert(DailyOrderRollup).from_select(
+                ['brand_id', 'day', 'status', 'order_count', 'revenue', 'items_sold', 'updated_at'],
+                source.statement
+            ))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return db.session.query(func.count(DailyOrderRollup.id)).scalar()
+
+    @staticmethod
+    def _bump(order, status, sign):
+        brand_id = db.session.query(User.brand_id).filter(User.id == order.user_id).scalar()
+        if brand_id is None:
+            return
+
+        values = {
+            'brand_id': brand_id,
+            'day': (order.created_at or datetime.utcnow()).date(),
+            'status': status or 'pending',
+            'order_count': sign,
+            'revenue': sign * (order.total_amount or 0),
+            'items_sold': sign * sum(item.quantity or 0 for item in order.items),
+            'updated_at': datetime.utcnow()
+        }
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('postgresql', 'sqlite'):
+            # Single-statement upsert: concurrent checkouts on the same bucket can't race
+            dialect_insert = postgresql.insert if dialect == 'postgresql' else sqlite.insert
+            stmt = dialect_insert(DailyOrderRollup).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['brand_id', 'day', 'status'],
+                set_={
+                    'order_count': DailyOrderRollup.order_count + stmt.excluded.order_count,
+                    'revenue': DailyOrderRollup.revenue + stmt.excluded.revenue,
+                    'items_sold': DailyOrderRollup.items_sold + stmt.excluded.items_sold,
+                    'updated_at': stmt.excluded.updated_at
+                }
+            )
+            db.session.execute(stmt)
+            return
+
+        rollup = DailyOrderRollup.query.filter_by(
+            brand_id=values['brand_id'], day=values['day'], status=values['status']
+        ).first()
+        if not rollup:
+            rollup = DailyOrderRollup(brand_id=brand_id, day=values['day'], status=values['status'],
+                                      order_count=0, revenue=0.0, items_sold=0)
+            db.session.add(rollup)
+        rollup.order_count += values['order_count']
+        rollup.revenue += values['revenue']
+        rollup.items_sold += values['items_sold']
@@ -4,16 +4,26 @@ from backend_app.models.cart import Cart, CartItem
 from backend_app.models.product import Product
 from backend_app.models.user import User
 from backend_app.models.payment import Payment
+from backend_app.services.order_rollup_service import OrderRollupService
+from backend_app.services.inventory_service import InventoryService
+from backend_app.utils.fieldsets import ORDER_FIELDS, ORDER_ITEM_FIELDS, PRODUCT_FIELDS
 from datetime import datetime
 import logging
 from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 
 logger = logging.getLogger(__name__)
 
+# Loader chain for order listings: items, their products and the products' brands
+# are fetched in two extra SELECTs for the whole page instead of per order/item.
+ORDER_LISTING_LOADERS = (
+    selectinload(Order.items).selectinload(OrderItem.product).joinedload(Product.brand),
+)
+
 
 class OrderService:
     @staticmethod
-    def get_all_orders(user_id=None, brand_id=None, status=None, limit=50, offset=0):
+    def get_all_orders(user_id=None, brand_id=None, status=None, limit=50, offset=0, fields=None):
         """Get all orders with optional filters"""
         query = Order.query
 
@@ -27,7 +37,8 @@ class OrderService:
             query = query.filter_by(status=status)
 
         total = query.count()
-        orders = query.order_by(Order.created_at.desc()).limit(limit).offset(offset).all()
+        orders = (OrderService._listing_query(query, fields)
+                  .order_by(Order.created_at.desc()).limit(limit).offset(offset).all())
 
         return {
             'orders': orders,
@@ -50,7 +61,10 @@ class OrderService:
     def create_order_from_cart(user_id, shipping_data, billing_data=None, notes=""):
         """Create order from user's cart"""
         try:
-            cart = Cart.query.filter_by(user_id=user_id).first()
+            cart = (Cart.query
+                    .options(selectinload(Cart.items).joinedload(CartItem.product))
+                    .filter_by(user_id=user_id)
+                    .first())
             if not cart or not cart.items:
                 raise ValueError("Cart is empty")
 
@@ -72,11 +86,13 @@ class OrderService:
                 notes=notes
             )
 
+            # Take stock for every line at once, or for none of them
+            InventoryService.reserve_stock(InventoryService.quantities_by_product(
+                (cart_item.product_id, cart_item.quantity) for cart_item in cart.items
+            ))
+
             # Create order items from cart items
             for cart_item in cart.items:
-                if cart_item.product.stock_quantity < cart_item.quantity:
-                    raise ValueError(f"Insufficient stock for {cart_item.product.title}")
-
                 order_item = OrderItem(
                     product_id=cart_item.product_id,
                     quantity=cart_item.quantity,
@@ -89,10 +105,9 @@ class OrderService:
                 )
                 order.items.append(order_item)
 
-                # Update product stock
-                cart_item.product.stock_quantity -= cart_item.quantity
-
             db.session.add(order)
+            db.session.flush()
+            OrderRollupService.record_order(order)
 
             # Clear cart after successful order
             cart.items = []
@@ -113,15 +128,15 @@ class OrderService:
             subtotal = 0
             order_items = []
 
+            product_ids = {item_data['product_id'] for item_data in items_data}
+            products = {p.id: p for p in Product.query.filter(Product.id.in_(product_ids))}
+
             # Validate items and calculate totals
             for item_data in items_data:
-                product = Product.query.get(item_data['product_id'])
+                product = products.get(item_data['product_id'])
                 if not product:
                     raise ValueError(f"Product not found: {item_data['product_id']}")
 
-                if product.stock_quantity < item_data.get('quantity', 1):
-                    raise ValueError(f"Insufficient stock for {product.title}")
-
                 quantity = item_data.get('quantity', 1)
                 subtotal += product.price * quantity
 
@@ -150,6 +165,10 @@ class OrderService:
                 notes=notes
             )
 
+            InventoryService.reserve_stock(InventoryService.quantities_by_product(
+                (item_data['product'].id, item_data['quantity']) for item_data in order_items
+            ))
+
             # Add order items
             for item_data in order_items:
                 order_item = OrderItem(
@@ -163,10 +182,9 @@ class OrderService:
                 )
                 order.items.append(order_item)
 
-                # Update stock
-                item_data['product'].stock_quantity -= item_data['quantity']
-
             db.session.add(order)
+            db.session.flush()
+            OrderRollupService.record_order(order)
             db.session.commit()
 
             return order
@@ -187,18 +205,24 @@ class OrderService:
         if status not in valid_statuses:
             raise ValueError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
 
+        previous_status = order.status
         order.status = status
         order.updated_at = datetime.utcnow()
+        OrderRollupService.move_status(order, previous_status, status)
+
+        if previous_status == 'pending' and status != 'pending':
+            # Stock is either confirmed or released below; the hold is done either way
+            InventoryService.drop_holds(order.id)
 
         if status == 'cancelled':
             order.cancelled_at = datetime.utcnow()
             order.cancellation_reason = cancellation_reason
 
-            # Restore stock for cancelled orders
-            for item in order.items:
-                product = Product.query.get(item.product_id)
-                if product:
-                    product.stock_quantity += item.quantity
+            # Restore stock for cancelled orders (once, even if cancelled again)
+            if previous_status != 'cancelled':
+                InventoryService.release_stock(InventoryService.quantities_by_product(
+                    (item.product_id, item.quantity) for item in order.items
+                ))
 
         elif status == 'delivered':
             order.delivered_at = datetime.utcnow()
@@ -227,8 +251,14 @@ class OrderService:
 
         order.tracking_number = tracking_number
         order.carrier = carrier
+        previous_status = order.status
         order.status = 'shipped'
         order.updated_at = datetime.utcnow()
+        OrderRollupService.move_status(order, previous_status, order.status)
+
+        if previous_status == 'pending':
+            # Shipping confirms the stock; a leftover hold would let the sweeper hand it back
+            InventoryService.drop_holds(order.id)
 
         if estimated_delivery:
             order.estimated_delivery = estimated_delivery
@@ -237,11 +267,12 @@ class OrderService:
         return order
 
     @staticmethod
-    def get_user_orders(user_id, limit=50, offset=0):
+    def get_user_orders(user_id, limit=50, offset=0, fields=None):
         """Get orders for a specific user"""
         query = Order.query.filter_by(user_id=user_id)
         total = query.count()
-        orders = query.order_by(Order.created_at.desc()).limit(limit).offset(offset).all()
+        orders = (OrderService._listing_query(query, fields)
+                  .order_by(Order.created_at.desc()).limit(limit).offset(offset).all())
 
         return {
             'orders': orders,
@@ -251,29 +282,44 @@ class OrderService:
         }
 
     @staticmethod
-    def calculate_order_stats(user_id=None, brand_id=None, start_date=None, end_date=None):
-        """Calculate order statistics"""
-        query = Order.query
+    def calculate_order_stats(user_id=None, brand_id=None, start_date=None, end_date=None, use_rollups=False):
+        """
+        Calculate order statistics with a single GROUP BY status aggregate.
+        With use_rollups, brand/platform stats are read from daily_order_rollups
+        (whole days, start and end inclusive) instead of scanning orders.
+        """
+        if use_rollups and not user_id:
+            rows = OrderRollupService.status_totals(brand_id, start_date, end_date)
+        else:
+            query = db.session.query(
+                Order.status,
+                func.count(Order.id),
+                func.coalesce(func.sum(Order.total_amount), 0)
+            )
 
-        if user_id:
-            query = query.filter_by(user_id=user_id)
+            if user_id:
+                query = query.filter(Order.user_id == user_id)
 
-        if brand_id:
-            query = query.join(User).filter(User.brand_id == brand_id)
+            if brand_id:
+                query = query.join(User, Order.user_id == User.id).filter(User.brand_id == brand_id)
+
+            if start_date:
+                query = query.filter(Order.created_at >= start_date)
 
-        if start_date:
-            query = query.filter(Order.created_at >= start_date)
+            if end_date:
+                query = query.filter(Order.created_at <= end_date)
 
-        if end_date:
-            query = query.filter(Order.created_at <= end_date)
+            rows = query.group_by(Order.status).all()
 
-        total_orders = query.count()
-        total_revenue = db.session.query(func.sum(Order.total_amount)).scalar() or 0
+        status_counts = {status: 0 for status in ['pending', 'processing', 'shipped', 'delivered', 'cancelled']}
+        status_revenue = {status: 0 for status in status_counts}
 
-        status_counts = {}
-        for status in ['pending', 'processing', 'shipped', 'delivered', 'cancelled']:
-            count = query.filter_by(status=status).count()
+        for status, count, revenue in rows:
             status_counts[status] = count
+            status_revenue[status] = revenue
+
+        total_orders = sum(status_counts.values())
+        total_revenue = sum(status_revenue.values())
 
         # Calculate average order value
         avg_order_value = total_revenue / total_orders if total_orders > 0 else 0
@@ -282,11 +328,12 @@ class OrderService:
             'total_orders': total_orders,
             'total_revenue': total_revenue,
             'average_order_value': avg_order_value,
-            'status_counts': status_counts
+            'status_counts': status_counts,
+            'status_revenue': status_revenue
         }
 
     @staticmethod
-    def search_orders(search_term, user_id=None, brand_id=None):
+    def search_orders(search_term, user_id=None, brand_id=None, fields=None):
         """Search orders by order number, customer name, or email"""
         query = Order.query
 
@@ -296,6 +343,8 @@ class OrderService:
         if brand_id:
             query = query.join(User).filter(User.brand_id == brand_id)
 
+        query = OrderService._listing_query(query, fields)
+
         # Search by order number
         orders_by_number = query.filter(Order.order_number.ilike(f'%{search_term}%')).all()
 
@@ -308,4 +357,53 @@ class OrderService:
         # Combine and remove duplicates
         all_orders = list({order.id: order for order in orders_by_number + orders_by_user}.values())
 
-        return all_orders
\ No newline at end of file
+        return all_orders
+
+    @staticmethod
+    def _listing_query(query, fields=None):
+        """
+        Listing options for a ?fields= selection (None means everything): order
+        columns are trimmed to the requested fields, and items are only loaded
+        when the payload uses them.
+        """
+        if fields is None or 'items' in fields:
+            query = query.options(*ORDER_LISTING_LOADERS)
+        elif 'items_count' in fields:
+            query = query.options(selectinload(Order.items))
+
+        return ORDER_FIELDS.load_only(query, fields)
+
+    @staticmethod
+    def serialize_orders(orders, include_items=False, fields=None):
+        """
+        Serialize a page of orders fetched with ORDER_LISTING_LOADERS.
+        Products shared between order lines are serialized once and reused.
+        With fields, only those keys are returned (items only if listed).
+        """
+        products = {}
+        payload = []
+
+        if fields is not None:
+            include_items = include_items and 'items' in fields
+            fields = [name for name in fields if name != 'items']
+
+        serialize_order = ORDER_FIELDS.serializer(fields)
+        serialize_item = ORDER_ITEM_FIELDS.serializer([name for name in ORDER_ITEM_FIELDS.fields if name != 'product'])
+        serialize_product = PRODUCT_FIELDS.serializer()
+
+        for order in orders:
+            data = serialize_order(order)
+
+            if include_items:
+                items = []
+                for item in order.items:
+                    if item.product_id not in products:
+                        products[item.product_id] = serialize_product(item.product) if item.product else None
+                    item_data = serialize_item(item)
+                    item_data['product'] = products[item.product_id]
+                    items.append(item_data)
+                data['items'] = items
+
+            payload.append(data)
+
+        return payload
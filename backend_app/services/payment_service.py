@@ -2,16 +2,24 @@ from backend_app.extensions import db
 from backend_app.models.payment import Payment
 from backend_app.models.order import Order
 from backend_app.models.user import User
+from backend_app.services.order_rollup_service import OrderRollupService
+from backend_app.services.inventory_service import InventoryService
+from backend_app.utils.token_cache import mpesa_token_cache
 from datetime import datetime
-import requests
+from flask import current_app
+from backend_app.utils import http_client
 import json
 import base64
 import logging
 from typing import Optional, Dict, Any
 import os
+from sqlalchemy import func
 
 logger = logging.getLogger(__name__)
 
+# Confirmed later by a provider callback: the order's stock is only held until INVENTORY_HOLD_TTL
+ASYNC_PAYMENT_METHODS = {'mpesa'}
+
 
 class PaymentService:
     def __init__(self):
@@ -27,10 +35,18 @@ class PaymentService:
         self.env = os.getenv('MPESA_ENV', 'sandbox')  # sandbox or production
 
     def generate_access_token(self):
-        """Generate M-Pesa access token"""
+        """Get an M-Pesa access token, reusing the cached one until it nears expiry"""
         if not self.mpesa_consumer_key or not self.mpesa_consumer_secret:
             raise ValueError("M-Pesa credentials not configured")
 
+        return mpesa_token_cache.get(self._token_cache_key(), self._request_access_token)
+
+    def _token_cache_key(self):
+        base_url = 'https://sandbox.safaricom.co.ke' if self.env == 'sandbox' else 'https://api.safaricom.co.ke'
+        return (base_url, self.mpesa_consumer_key)
+
+    def _request_access_token(self):
+        """Request a new access token from Daraja; returns (token, expires_in)"""
         # Encode consumer key and secret
         credentials = f"{self.mpesa_consumer_key}:{self.mpesa_consumer_secret}"
         encoded_credentials = base64.b64encode(credentials.encode()).decode()
@@ -44,14 +60,15 @@ class PaymentService:
         }
 
         try:
-            response = requests.get(
+            response = http_client.get(
                 f'{base_url}/oauth/v1/generate?grant_type=client_credentials',
                 headers=headers,
                 timeout=30
             )
 
             if response.status_code == 200:
-                return response.json()['access_token']
+                data = response.json()
+                return data['access_token'], int(data.get('expires_in', 3599))
             else:
                 logger.error(f"Failed to get access token: {response.text}")
                 raise Exception(f"Failed to get M-Pesa access token: {response.status_code}")
@@ -104,13 +121,17 @@ class PaymentService:
             base_url = 'https://sandbox.safaricom.co.ke' if self.env == 'sandbox' else 'https://api.safaricom.co.ke'
 
             # Send STK Push request
-            response = requests.post(
+            response = http_client.post(
                 f'{base_url}/mpesa/stkpush/v1/processrequest',
                 headers=headers,
                 data=json.dumps(payload),
                 timeout=30
             )
 
+            if response.status_code == 401:
+                # Token revoked before its expiry; make the next call fetch a new one
+                mpesa_token_cache.invalidate(self._token_cache_key())
+
             if response.status_code == 200:
                 data = response.json()
 
@@ -179,13 +200,16 @@ class PaymentService:
 
             base_url = 'https://sandbox.safaricom.co.ke' if self.env == 'sandbox' else 'https://api.safaricom.co.ke'
 
-            response = requests.post(
+            response = http_client.post(
                 f'{base_url}/mpesa/stkpushquery/v1/query',
                 headers=headers,
                 data=json.dumps(payload),
                 timeout=30
             )
 
+            if response.status_code == 401:
+                mpesa_token_cache.invalidate(self._token_cache_key())
+
             if response.status_code == 200:
                 data = response.json()
 
@@ -209,8 +233,7 @@ class PaymentService:
                         # Update order status
                         order = Order.query.get(payment.order_id)
                         if order:
-                            order.status = 'processing'
-                            order.updated_at = datetime.utcnow()
+                            self._fulfil_paid_order(order)
                     else:
                         payment.status = 'failed'
                         payment.result_description = result_desc
@@ -254,6 +277,12 @@ class PaymentService:
                 payment.phone_number = kwargs['phone_number']
                 payment.provider = 'safaricom'
 
+            if payment_method in ASYNC_PAYMENT_METHODS:
+                InventoryService.hold_for_payment(order, current_app.config['INVENTORY_HOLD_TTL'])
+            else:
+                # Cash on delivery, bank transfer...: settled by hand, so the stock stays taken
+                InventoryService.drop_holds(order.id)
+
             db.session.add(payment)
             db.session.commit()
 
@@ -279,8 +308,7 @@ class PaymentService:
                 # Update order status
                 order = Order.query.get(payment.order_id)
                 if order:
-                    order.status = 'processing'
-                    order.updated_at = datetime.utcnow()
+                    self._fulfil_paid_order(order)
 
             elif status == 'failed':
                 payment.failed_at = datetime.utcnow()
@@ -302,6 +330,18 @@ class PaymentService:
             logger.error(f"Error updating payment status: {str(e)}")
             raise
 
+    def _fulfil_paid_order(self, order: Order):
+        """Convert the order's inventory holds and move it on to processing"""
+        if not InventoryService.convert_holds(order):
+            logger.error(f"Order {order.order_number} was paid after its inventory hold expired "
+                         f"and the stock has since sold out; it stays cancelled and needs a refund")
+            return
+
+        previous_status = order.status
+        order.status = 'processing'
+        order.updated_at = datetime.utcnow()
+        OrderRollupService.move_status(order, previous_status, order.status)
+
     def process_mpesa_callback(self, callback_data: Dict[str, Any]):
         """Process M-Pesa STK Push callback"""
         try:
@@ -389,6 +429,44 @@ class PaymentService:
         """Get all payments for an order"""
         return Payment.query.filter_by(order_id=order_id).order_by(Payment.created_at.desc()).all()
 
+    def get_payment_stats(self, user_id: Optional[int] = None, brand_id: Optional[int] = None,
+                          start_date: Optional[datetime] = None, end_date: Optional[datetime] = None):
+        """Payment counts and amounts per status in one grouped aggregate query"""
+        query = db.session.query(
+            Payment.status,
+            func.count(Payment.id),
+            func.coalesce(func.sum(Payment.amount), 0)
+        )
+
+        if user_id:
+            query = query.filter(Payment.user_id == user_id)
+
+        if brand_id:
+            query = query.join(User, Payment.user_id == User.id).filter(User.brand_id == brand_id)
+
+        if start_date:
+            query = query.filter(Payment.initiated_at >= start_date)
+
+        if end_date:
+            query = query.filter(Payment.initiated_at <= end_date)
+
+        counts = {}
+        total_payments = 0
+        total_amount = 0
+        for status, count, amount in query.group_by(Payment.status).all():
+            counts[status] = count
+            total_payments += count
+            total_amount += amount
+
+        return {
+            'total_payments': total_payments,
+            'total_amount': total_amount,
+            'successful_payments': counts.get('completed', 0),
+            'pending_payments': counts.get('pending', 0),
+            'failed_payments': counts.get('failed', 0),
+            'refunded_payments': counts.get('refunded', 0)
+        }
+
     def get_user_payments(self, user_id: int, limit: int = 50, offset: int = 0):
         """Get payments for a user"""
         query = Payment.query.filter_by(user_id=user_id)
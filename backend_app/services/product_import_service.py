@@ -0,0 +1,243 @@
+# backend_app/services/product_import_service.py
+import csv
+import io
+import json
+import math
+from backend_app.extensions import db
+from backend_app.models.brand import Brand
+from backend_app.models.product import Product
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+REQUIRED_FIELDS = ('title', 'image_url', 'price', 'category', 'product_type', 'style_tag')
+TEXT_FIELDS = ('title', 'image_url', 'category', 'product_type', 'style_tag', 'description',
+               'artist', 'size', 'color', 'material', 'model_3d_url')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+FALSE_VALUES = {'0', 'false', 'no', 'n', 'f'}
+
+# Only the first errors are listed in the report; `failed` still counts them all
+MAX_REPORTED_ERRORS = 1000
+
+
+class ProductImportService:
+    """
+    Bulk catalog import from CSV or JSON Lines. The input is read as a stream
+    and handled chunk by chunk: each chunk costs one duplicate-title query, at
+    most one brand query and one multi-row INSERT, then is committed, so memory
+    stays flat however large the file is. A chunk the database rejects is
+    retried row by row, so only the offending rows fail.
+    """
+
+    @staticmethod
+    def import_products(stream, fmt, brand_id=None, allow_row_brand=False, chunk_size=1000):
+        """
+        Import products from a binary stream in 'csv' or 'jsonl' format.
+
+        brand_id applies to every row; with allow_row_brand (super_admin) a row
+        may name its own brand_id instead. Returns a report with the number of
+        products created and the rows that were rejected, by row number.
+        """
+        report = {'created': 0, 'failed': 0, 'errors': []}
+        seen_titles = set()
+        known_brands = set()
+
+        chunk = []
+        try:
+            for row_number, raw in ProductImportService.iter_rows(stream, fmt):
+                chunk.append((row_number, raw))
+                if len(chunk) >= chunk_size:
+                    ProductImportService._import_chunk(chunk, brand_id, allow_row_brand,
+                                                       seen_titles, known_brands, report)
+                    chunk = []
+        except UnicodeDecodeError:
+            report['aborted'] = 'File is not valid UTF-8; rows after the last one reported were not read'
+        except csv.Error as e:
+            report['aborted'] = f"Malformed CSV: {e}"
+
+        if chunk:
+            ProductImportService._import_chunk(chunk, brand_id, allow_row_brand,
+                                               seen_titles, known_brands, report)
+
+        report['errors'].sort(key=lambda error: error['row'])
+        report['errors_truncated'] = report['failed'] > len(report['errors'])
+        return report
+
+    @staticmethod
+    def detect_format(filename=None, mimetype=None):
+        """'csv' or 'jsonl' from a file name or Content-Type, else None"""
+        filename = (filename or '').lower()
+        if filename.endswith('.csv') or mimetype == 'text/csv':
+            return 'csv'
+        if filename.endswith(('.jsonl', '.ndjson')) or mimetype in ('application/jsonl', 'application/x-ndjson'):
+            return 'jsonl'
+        return None
+
+    @staticmethod
+    def iter_rows(stream, fmt):
+        """Yield (row_number, dict) pairs; unparsable rows yield a ValueError instead of a dict"""
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+        if fmt == 'csv':
+            for row_number, row in enumerate(csv.DictReader(text), start=1):
+                if None in row:
+                    yield row_number, ValueError('Row has more columns than the header')
+                else:
+                    yield row_number, row
+        elif fmt == 'jsonl':
+            row_number = 0
+            for line in text:
+                if not line.strip():
+                    continue
+                row_number += 1
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    yield row_number, ValueError('Invalid JSON')
+                    continue
+                if not isinstance(row, dict):
+                    yield row_number, ValueError('Each line must be a JSON object')
+                else:
+                    yield row_number, row
+        else:
+            raise ValueError("Unsupported import format: use 'csv' or 'jsonl'")
+
+    @staticmethod
+    def validate_row(raw):
+        """Turn one input row into Product column values, or raise ValueError"""
+        if isinstance(raw, Exception):
+            raise raw
+
+        values = {}
+        for field in TEXT_FIELDS:
+            value = raw.get(field)
+            value = str(value).strip() if value is not None else ''
+            values[field] = value or None
+
+        missing = [field for field in REQUIRED_FIELDS
+                   if not (values[field] if field in values else str(raw.get(field) or '').strip())]
+        if missing:
+            raise ValueError(f"Missing required field: {', '.join(missing)}")
+
+        for field in TEXT_FIELDS:
+            max_length = Product.__table__.c[field].type.length
+            if max_length and values[field] and len(values[field]) > max_length:
+                raise ValueError(f"{field} is longer than {max_length} characters")
+
+        values['price'] = ProductImportService._number(raw.get('price'), 'price', float)
+        values['stock_quantity'] = ProductImportService._number(raw.get('stock_quantity'), 'stock_quantity', int, default=0)
+        values['model_scale'] = ProductImportService._number(raw.get('model_scale'), 'model_scale', float,
+                                                             default=1.0, minimum=None)
+        values['has_3d_model'] = ProductImportService._boolean(raw.get('has_3d_model'), 'has_3d_model', False)
+        values['is_active'] = ProductImportService._boolean(raw.get('is_active'), 'is_active', True)
+
+        model_position = raw.get('model_position')
+        if isinstance(model_position, str):
+            try:
+                model_position = json.loads(model_position) if model_position.strip() else None
+            except ValueError:
+                raise ValueError('model_position must be JSON')
+        values['model_position'] = model_position
+
+        return values
+
+    @staticmethod
+    def _import_chunk(chunk, brand_id, allow_row_brand, seen_titles, known_brands, report):
+        valid = []
+        for row_number, raw in chunk:
+            try:
+                values = ProductImportService.validate_row(raw)
+                values['brand_id'] = brand_id
+                if allow_row_brand:
+                    values['brand_id'] = ProductImportService._number(raw.get('brand_id'), 'brand_id', int,
+                                                                      default=brand_id)
+            except ValueError as e:
+                ProductImportService._reject(report, row_number, str(e))
+                continue
+
+            if values['brand_id'] is None:
+                ProductImportService._reject(report, row_number, 'brand_id is required')
+                continue
+
+            valid.append((row_number, values))
+
+        # One query per chunk for titles already in the catalog...
+        titles = {values['title'] for _, values in valid}
+        existing_titles = {title for (title,) in db.session.query(Product.title)
+                           .filter(Product.is_active == True, Product.title.in_(titles))}
+
+        # ...and one for brands this import has not seen yet
+        unknown_brands = {values['brand_id'] for _, values in valid} - known_brands
+        if unknown_brands:
+            known_brands.update(brand for (brand,) in db.session.query(Brand.id).filter(Brand.id.in_(unknown_brands)))
+
+        rows = []
+        for row_number, values in valid:
+            if values['title'] in existing_titles or values['title'] in seen_titles:
+                ProductImportService._reject(report, row_number, 'Product with this title already exists')
+            elif values['brand_id'] not in known_brands:
+                ProductImportService._reject(report, row_number, 'Invalid brand_id: brand does not exist')
+            else:
+                seen_titles.add(values['title'])
+                rows.append((row_number, values))
+
+        if not rows:
+            return
+
+        try:
+            # A list of parameter sets runs as one batched executemany INSERT
+            db.session.execute(insert(Product), [values for _, values in rows])
+            db.session.commit()
+            report['created'] += len(rows)
+            return
+        except IntegrityError:
+            # e.g. a brand deleted since it was checked; earlier chunks stay committed
+            db.session.rollback()
+
+        for row_number, values in rows:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(insert(Product), values)
+                report['created'] += 1
+            except IntegrityError as e:
+                seen_titles.discard(values['title'])
+                ProductImportService._reject(report, row_number,
+                                             f"Rejected by the database: {str(e.orig).splitlines()[0]}")
+        db.session.commit()
+
+    @staticmethod
+    def _reject(report, row_number, error):
+        report['failed'] += 1
+        if len(report['errors']) < MAX_REPORTED_ERRORS:
+            report['errors'].append({'row': row_number, 'error': error})
+
+    @staticmethod
+    def _number(value, field, kind, default=None, minimum=0):
+        if value is None or value == '':
+            if default is not None:
+                return default
+            raise ValueError(f"{field} is required")
+        try:
+            number = kind(value)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"{field} must be a number")
+        # float() also accepts 'nan' and 'inf'
+        if not math.isfinite(number):
+            raise ValueError(f"{field} must be a finite number")
+        if minimum is not None and number < minimum:
+            raise ValueError(f"{field} cannot be negative")
+        return number
+
+    @staticmethod
+    def _boolean(value, field, default):
+        if value is None:
+            return default
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text == '':
+            return default
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+        raise ValueError(f"{field} must be true or false")
@@ -2,8 +2,14 @@
 from backend_app.extensions import db
 from backend_app.models.product import Product
 from backend_app.models.brand import Brand
+from backend_app.services.inventory_service import InventoryService, StockBelowHeldError
+from backend_app.services.search_service import SearchService
+from sqlalchemy import Integer, case, column, update, values
 from sqlalchemy.exc import SQLAlchemyError
 
+# Rows per UPDATE statement in bulk stock updates (keeps bind parameters under driver limits)
+STOCK_UPDATE_BATCH_SIZE = 5000
+
 class ProductService:
     @staticmethod
     def get_all_products():
@@ -31,12 +37,9 @@ class ProductService:
 
     @staticmethod
     def search_products(query):
-        return Product.query.filter(
-            Product.is_active == True,
-            (Product.title.ilike(f'%{query}%') |
-             Product.description.ilike(f'%{query}%') |
-             Product.artist.ilike(f'%{query}%'))
-        ).all()
+        """Ranked full-text search over active products"""
+        products = Product.query.filter(Product.is_active == True)
+        return SearchService.apply_product_search(products, query).all()
 
     @staticmethod
     def create_product(current_user,title, image_url, price, category, product_type, style_tag,
@@ -136,9 +139,116 @@ class ProductService:
             return None
 
         try:
-            product.stock_quantity = quantity
+            # quantity is what is on hand; units held for unpaid orders are not for sale
+            if not ProductService._set_stock_levels([(product_id, quantity)]):
+                db.session.rollback()
+                held = InventoryService.held_by_product([product_id]).get(product_id, 0)
+                raise StockBelowHeldError(product_id, quantity, held)
             db.session.commit()
             return product
         except SQLAlchemyError as e:
             db.session.rollback()
-            raise RuntimeError(f"Database error while updating stock: {str(e)}")
\ No newline at end of file
+            raise RuntimeError(f"Database error while updating stock: {str(e)}")
+
+    @staticmethod
+    def bulk_update_stock(current_user, updates):
+        """
+        Set stock levels for many products in one transaction - Only admin/super_admin.
+
+        updates is a list of {'product_id', 'stock_quantity'} entries; a repeated
+        product_id keeps its last value. Admins may only touch their own brand's
+        products. Unknown, foreign and malformed entries are reported, the rest
+        are applied. Each stock_quantity is the counted on-hand figure: units
+        held for unpaid orders are subtracted before it is stored (see
+        InventoryService.held_quantity), so releasing a hold later does not
+        count them twice. A count below the units held is rejected and
+        listed in below_held rather than stored as negative stock.
+        """
+        if current_user.role not in ['admin', 'super_admin']:
+            raise PermissionError("Unauthorized: Only admin or super_admin can update stock")
+
+        levels = {}
+        errors = []
+        for index, entry in enumerate(updates):
+            if not isinstance(entry, dict):
+                errors.append({'index': index, 'error': 'Entry must be an object'})
+                continue
+            if 'product_id' not in entry:
+                error = 'sku is not supported; use product_id' if 'sku' in entry else 'product_id is required'
+                errors.append({'index': index, 'error': error})
+                continue
+
+            product_id, quantity = entry.get('product_id'), entry.get('stock_quantity')
+            if not isinstance(product_id, int) or isinstance(product_id, bool):
+                errors.append({'index': index, 'error': 'product_id must be an integer'})
+            elif not isinstance(quantity, int) or isinstance(quantity, bool) or quantity < 0:
+                errors.append({'index': index, 'error': 'stock_quantity must be a non-negative integer'})
+            else:
+                levels[product_id] = quantity
+
+        # Ownership for the whole batch is checked against one lookup
+        brands = {}
+        product_ids = list(levels)
+        for start in range(0, len(product_ids), STOCK_UPDATE_BATCH_SIZE):
+            batch = product_ids[start:start + STOCK_UPDATE_BATCH_SIZE]
+            brands.update(db.session.query(Product.id, Product.brand_id)
+                          .filter(Product.id.in_(batch), Product.is_active == True))
+
+        unknown_ids = sorted(set(levels) - set(brands))
+        forbidden_ids = set()
+        if current_user.role == 'admin':
+            forbidden_ids = {pid for pid, brand_id in brands.items() if brand_id != current_user.brand_id}
+
+        allowed = {pid: levels[pid] for pid in brands if pid not in forbidden_ids}
+
+        below_held = []
+        try:
+            items = list(allowed.items())
+            updated = set()
+            for start in range(0, len(items), STOCK_UPDATE_BATCH_SIZE):
+                updated.update(ProductService._set_stock_levels(items[start:start + STOCK_UPDATE_BATCH_SIZE]))
+
+            # Only the rejected entries pay for looking up what is held
+            rejected = sorted(set(allowed) - updated)
+            held = InventoryService.held_by_product(rejected)
+            below_held = [{'product_id': pid, 'stock_quantity': allowed[pid], 'held': held.get(pid, 0)}
+                          for pid in rejected]
+            db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            raise RuntimeError(f"Database error while updating stock: {str(e)}")
+
+        return {
+            'updated': len(allowed) - len(below_held),
+            'unknown_ids': unknown_ids,
+            'forbidden_ids': sorted(forbidden_ids),
+            'below_held': below_held,
+            'errors': errors
+        }
+
+    @staticmethod
+    def _set_stock_levels(items):
+        """
+        One UPDATE for a batch of (product_id, on-hand quantity) pairs, net of
+        holds. Rows whose quantity is below what is held are left alone; the
+        ids of the rows written are returned.
+        """
+        held = InventoryService.held_quantity()
+        if db.session.get_bind().dialect.name == 'postgresql':
+            # UPDATE products SET ... FROM (VALUES (...), ...) AS stock_levels (id, stock_quantity)
+            stock_levels = values(
+                column('id', Integer), column('stock_quantity', Integer), name='stock_levels'
+            ).data(items)
+            statement = (update(Product)
+                         .where(Product.id == stock_levels.c.id, stock_levels.c.stock_quantity >= held)
+                         .values(stock_quantity=stock_levels.c.stock_quantity - held))
+        else:
+            # Other databases do not all accept column names on a VALUES list
+            counted = case(dict(items), value=Product.id)
+            statement = (update(Product)
+                         .where(Product.id.in_([pid for pid, _ in items]), counted >= held)
+                         .values(stock_quantity=counted - held))
+
+        return set(db.session.execute(
+            statement.returning(Product.id).execution_options(synchronize_session=False)
+        ).scalars())
\ No newline at end of file
@@ -0,0 +1,65 @@
+# backend_app/services/search_service.py
+import re
+from sqlalchemy import func, or_, case, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from backend_app.models.product import Product
+
+# Must match the text search configuration used by products.search_vector
+SEARCH_CONFIG = 'english'
+
+
+class SearchService:
+    @staticmethod
+    def tokenize(term):
+        """Split a raw search box value into lowercase words, dropping punctuation"""
+        return re.findall(r'[^\W_]+', (term or '').lower())
+
+    @staticmethod
+    def build_prefix_tsquery(tokens):
+        """
+        Builds a tsquery where every word is a prefix match, so partially typed
+        words from the storefront search box still hit ('afro be' -> 'afro:* & be:*').
+        """
+        return ' & '.join(f'{token}:*' for token in tokens)
+
+    @staticmethod
+    def apply_product_search(query, term, ranked=True):
+        """
+        Restricts a Product query to rows matching the search term.
+        On Postgres this uses the GIN-indexed search_vector and, when ranked,
+        orders by relevance. Other databases fall back to ILIKE matching.
+        """
+        tokens = SearchService.tokenize(term)
+        if not tokens:
+            return query
+
+        if query.session.get_bind().dialect.name == 'postgresql':
+            return SearchService._fulltext_search(query, tokens, ranked)
+        return SearchService._fallback_search(query, tokens, ranked)
+
+    @staticmethod
+    def _fulltext_search(query, tokens, ranked):
+        search_vector = literal_column('products.search_vector', type_=TSVECTOR)
+        ts_query = func.to_tsquery(SEARCH_CONFIG, SearchService.build_prefix_tsquery(tokens))
+
+        query = query.filter(search_vector.op('@@')(ts_query))
+        if ranked:
+            query = query.order_by(func.ts_rank_cd(search_vector, ts_query).desc(), Product.id.desc())
+        return query
+
+    @staticmethod
+    def _fallback_search(query, tokens, ranked):
+        # Every word has to appear in at least one of the searchable fields
+        for token in tokens:
+            pattern = f'%{token}%'
+            query = query.filter(or_(
+                Product.title.ilike(pattern),
+                Product.description.ilike(pattern),
+                Product.artist.ilike(pattern)
+            ))
+
+        if ranked:
+            # Title hits first, mirroring the weight title gets in search_vector
+            title_hit = case((Product.title.ilike(f'%{tokens[0]}%'), 0), else_=1)
+            query = query.order_by(title_hit, Product.id.desc())
+        return query
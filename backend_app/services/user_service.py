@@ -1,5 +1,6 @@
 from backend_app.extensions import db
 from backend_app.models.user import User
+from backend_app.utils.jwt_helper import revoke_user_tokens
 
 
 class UserService:
@@ -21,6 +22,10 @@ class UserService:
         allowed_fields = ['name', 'email', 'role', 'preferences', 'bio',
                          'location', 'website', 'phone', 'avatar_url', 'banner_url']
 
+        if 'role' in data and data['role'] != user.role:
+            # Outstanding tokens carry the old role claim
+            revoke_user_tokens(user)
+
         for key, value in data.items():
             if hasattr(user, key) and key in allowed_fields:
                 setattr(user, key, value)
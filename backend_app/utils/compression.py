@@ -0,0 +1,173 @@
+# backend_app/utils/compression.py
+import gzip
+import threading
+import zlib
+from collections import OrderedDict
+from flask import current_app, g, request
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/csv'}
+GZIP_LEVEL = 6
+# Dynamic responses: quality 5 compresses better than gzip -6 at a similar speed
+BROTLI_QUALITY = 5
+
+
+class CompressedBodyCache:
+    """
+    LRU of compressed response bodies keyed by (ETag, encoding), bounded by
+    total bytes. An ETag names one exact payload, so a hit can be sent as is
+    without running the view, serializing or compressing again.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+
+    def get(self, etag, encoding):
+        with self._lock:
+            body = self._entries.get((etag, encoding))
+            if body is not None:
+                self._entries.move_to_end((etag, encoding))
+            return body
+
+    def put(self, etag, encoding, body):
+        # A body bigger than a quarter of the cache would just flush it
+        if len(body) > self.max_bytes // 4:
+            return
+
+        with self._lock:
+            previous = self._entries.pop((etag, encoding), None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[(etag, encoding)] = body
+            self._size += len(body)
+
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
+compressed_bodies = CompressedBodyCache()
+
+
+def init_compression(app):
+    """Compress the app's responses and size the compressed body cache from its config"""
+    compressed_bodies.max_bytes = app.config['COMPRESSION_CACHE_MAX_BYTES']
+    app.after_request(compress_response)
+
+
+def negotiate_encoding():
+    """'br' or 'gzip' per the request's Accept-Encoding, or None to send it uncompressed"""
+    if not current_app.config['COMPRESSION_ENABLED']:
+        return None
+    return request.accept_encodings.best_match(['br', 'gzip'] if brotli else ['gzip'])
+
+
+def encoded_etag(etag, encoding):
+    """Each encoding is its own representation, so it gets its own ETag"""
+    return f"{etag}-{encoding}" if encoding else etag
+
+
+def compress(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def cached_response(etag, encoding):
+    """Response holding the cached compressed body for etag, or None on a miss"""
+    body = compressed_bodies.get(etag, encoding)
+    if body is None:
+        return None
+
+    response = current_app.response_class(body, mimetype='application/json')
+    response.headers['Content-Encoding'] = encoding
+    response.set_etag(encoded_etag(etag, encoding))
+    return response
+
+
+def cache_compressed_body():
+    """Ask compress_response to keep this request's compressed body for cached_response()"""
+    g.cache_compressed_body = True
+
+
+def compress_response(response):
+    """
+    after_request hook: gzip/brotli-encode JSON and text responses the client
+    accepts. Streamed bodies are compressed chunk by chunk as they are sent.
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+
+    encoding = negotiate_encoding()
+    if (encoding is None
+            or response.status_code < 200 or response.status_code in (204, 206, 304)
+            or request.method == 'HEAD'
+            or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or response.cache_control.no_transform):
+        return response
+
+    etag, _ = response.get_etag()
+    cache = g.pop('cache_compressed_body', False) and etag is not None and response.status_code == 200
+
+    if response.is_streamed:
+        store = (lambda body: compressed_bodies.put(etag, encoding, body)) if cache else None
+        response.response = _compress_stream(response.response, encoding, store)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < current_app.config['COMPRESSION_MIN_BYTES']:
+            return response
+        body = compress(data, encoding)
+        response.set_data(body)
+        if cache:
+            compressed_bodies.put(etag, encoding, body)
+
+    response.headers['Content-Encoding'] = encoding
+    if etag is not None:
+        response.set_etag(encoded_etag(etag, encoding))
+    return response
+
+
+def _compress_stream(chunks, encoding, on_complete=None):
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        process, finish = compressor.process, compressor.finish
+    else:
+        # wbits=31 writes a gzip header and trailer around the deflate stream
+        compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+        process, finish = compressor.compress, compressor.flush
+    sent = [] if on_complete is not None else None
+
+    try:
+        for chunk in chunks:
+            data = process(chunk.encode() if isinstance(chunk, str) else chunk)
+            if data:
+                if sent is not None:
+                    sent.append(data)
+                yield data
+        data = finish()
+        if sent is not None:
+            sent.append(data)
+        yield data
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+
+    # Only a body that was streamed to the end is worth keeping
+    if on_complete is not None:
+        on_complete(b''.join(sent))
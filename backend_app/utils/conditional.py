@@ -0,0 +1,72 @@
+# backend_app/utils/conditional.py
+import hashlib
+from functools import wraps
+from flask import current_app, make_response, request
+from werkzeug.http import is_resource_modified
+from backend_app.extensions import db
+from backend_app.models.table_version import VERSIONED_TABLES, TableVersion
+from backend_app.utils.compression import (
+    cache_compressed_body, cached_response, encoded_etag, negotiate_encoding
+)
+
+
+def table_versions(*models):
+    """The TableVersion counter of each model's table, from one primary-key lookup"""
+    names = [model.__tablename__ for model in models]
+    versions = dict(db.session.query(TableVersion.table_name, TableVersion.version)
+                    .filter(TableVersion.table_name.in_(names)))
+    return tuple(versions.get(name, 0) for name in names)
+
+
+def conditional(*models):
+    """
+    Conditional GET for listings built from `models` (each in VERSIONED_TABLES).
+
+    The ETag covers the models' table versions plus the request URL and its
+    Authorization header (listings can depend on the caller's brand). No
+    Last-Modified is sent and If-Modified-Since is ignored: a listing has no
+    trustworthy date, since deleting its newest row or two writes within a
+    second would leave one unchanged. When the client's copy is still current
+    the view is never called: a bodyless 304 goes back instead, so nothing
+    is loaded or serialized. Otherwise a compressed body cached under the
+    same ETag is sent as is, and only a miss runs the view.
+    """
+    for model in models:
+        if model.__tablename__ not in VERSIONED_TABLES:
+            raise ValueError(f"{model.__tablename__} is not in VERSIONED_TABLES")
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = hashlib.sha1(repr((
+                request.full_path,
+                request.headers.get('Authorization'),
+                table_versions(*models)
+            )).encode()).hexdigest()
+
+            # The client may hold either the plain or the compressed representation
+            encoding = negotiate_encoding()
+            current = [etag, encoded_etag(etag, encoding)] if encoding else [etag]
+            matched = next((candidate for candidate in current
+                            if not is_resource_modified(request.environ, etag=candidate)), None)
+
+            if matched is not None:
+                response = current_app.response_class(status=304)
+                response.set_etag(matched)
+            else:
+                response = cached_response(etag, encoding) if encoding else None
+                if response is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    response.set_etag(etag)
+                    cache_compressed_body()
+
+            response.vary.add('Authorization')
+            # Let clients keep the body but revalidate before every reuse
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
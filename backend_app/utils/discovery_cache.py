@@ -0,0 +1,107 @@
+# backend_app/utils/discovery_cache.py
+import logging
+import re
+import threading
+import time
+from backend_app.utils import http_client
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cache_control(header):
+    """Returns (max_age, stale_while_revalidate) in seconds; None when absent"""
+    directives = {}
+    for part in (header or '').split(','):
+        name, _, value = part.strip().partition('=')
+        directives[name.lower()] = value.strip('"')
+
+    def seconds(name):
+        value = directives.get(name)
+        return int(value) if value and re.fullmatch(r'\d+', value) else None
+
+    if 'no-store' in directives or 'no-cache' in directives:
+        return 0, seconds('stale-while-revalidate')
+    return seconds('max-age'), seconds('stale-while-revalidate')
+
+
+class DiscoveryDocumentCache:
+    """
+    TTL cache for a JSON document such as an OpenID discovery document.
+
+    Freshness follows the response's Cache-Control max-age (default_ttl when
+    missing). Once stale, the cached copy is still served for the header's
+    stale-while-revalidate (stale_ttl when missing) while a single background
+    thread re-fetches it, so a login burst never waits on the provider. Only
+    a cold cache blocks, and the network call never runs under self._lock.
+    """
+
+    def __init__(self, url, default_ttl=3600, stale_ttl=60):
+        self.url = url
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()  # guards the fields below, never held across I/O
+        self._fetch_lock = threading.Lock()  # one blocking fetch at a time on a cold cache
+        self._document = None
+        self._fresh_until = 0
+        self._stale_until = 0
+        self._refreshing = False
+
+    def get(self):
+        now = time.monotonic()
+        with self._lock:
+            document, fresh_until, stale_until = self._document, self._fresh_until, self._stale_until
+
+        if document is not None and now < fresh_until:
+            return document
+
+        if document is not None and now < stale_until:
+            self._refresh_in_background()
+            return document
+
+        with self._fetch_lock:
+            # Another thread may have fetched while we waited
+            with self._lock:
+                if self._document is not None and time.monotonic() < self._fresh_until:
+                    return self._document
+            return self._store(*self._fetch())
+
+    def invalidate(self):
+        with self._lock:
+            self._fresh_until = 0
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh():
+            try:
+                self._store(*self._fetch())
+            except Exception as e:
+                # Keep serving the stale copy; the next request will retry
+                logger.warning(f"Background refresh of {self.url} failed: {str(e)}")
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def _fetch(self):
+        """(document, ttl, stale window) from the provider; touches no shared state"""
+        response = http_client.get(self.url)
+        response.raise_for_status()
+        document = response.json()
+
+        max_age, stale_while_revalidate = parse_cache_control(response.headers.get('Cache-Control'))
+        ttl = self.default_ttl if max_age is None else max_age
+        stale = self.stale_ttl if stale_while_revalidate is None else max(stale_while_revalidate, 0)
+        return document, ttl, stale
+
+    def _store(self, document, ttl, stale):
+        now = time.monotonic()
+        with self._lock:
+            self._document = document
+            self._fresh_until = now + ttl
+            self._stale_until = now + ttl + stale
+        return document
@@ -0,0 +1,155 @@
+# backend_app/utils/fieldsets.py
+from operator import attrgetter
+from sqlalchemy import Date, DateTime
+from sqlalchemy.orm import load_only
+from backend_app.models.brand import Brand
+from backend_app.models.cart import CartItem
+from backend_app.models.order import Order, OrderItem
+from backend_app.models.product import Product
+from backend_app.models.user import User
+
+
+class InvalidFields(ValueError):
+    pass
+
+
+class Fieldset:
+    """
+    Payload definition for one model: the to_dict() keys plus sparse fieldset
+    support (?fields=id,title,price).
+
+    `fields` lists every key a client may ask for, in payload order; keys in
+    `extra` are only returned when asked for. Plain column keys are serialized
+    the way to_dict() does; everything else is declared in `derived` as
+    {key: (columns it reads, function(obj))}. load_only() narrows the SELECT
+    to the columns the requested keys need.
+    """
+
+    # Distinct field lists compiled per model before the cache starts over
+    MAX_COMPILED = 256
+
+    def __init__(self, model, fields, derived=None, extra=()):
+        self.model = model
+        self.fields = tuple(fields)
+        self.derived = derived or {}
+        self.default_fields = tuple(name for name in self.fields if name not in extra)
+        self._compiled = {}
+
+    def parse(self, raw):
+        """Requested keys from a ?fields= value, or None to return everything"""
+        if raw is None:
+            return None
+
+        requested = {name.strip() for name in raw.split(',') if name.strip()}
+        if not requested:
+            return None
+
+        unknown = requested.difference(self.fields)
+        if unknown:
+            raise InvalidFields(f"Unknown fields: {', '.join(sorted(unknown))}. "
+                                f"Allowed: {', '.join(self.fields)}")
+
+        return [name for name in self.fields if name in requested]
+
+    def load_only(self, query, fields, always=()):
+        """Restrict the model's loaded columns to what `fields` (and `always`) need"""
+        if fields is None:
+            return query
+
+        columns = {'id', *always}
+        for name in fields:
+            columns.update(self.derived[name][0] if name in self.derived else (name,))
+
+        return query.options(load_only(*(getattr(self.model, name) for name in sorted(columns))))
+
+    def serialize(self, obj, fields=None):
+        """Payload dict holding `fields` (to_dict()'s keys when None)"""
+        return self.serializer(fields)(obj)
+
+    def serializer(self, fields=None):
+        """
+        Function turning an instance into its payload dict. It is compiled once
+        per field list: attribute getters and date handling are chosen from the
+        column types up front, so serializing a row does no per-value checks.
+        """
+        key = self.default_fields if fields is None else tuple(fields)
+        compiled = self._compiled.get(key)
+
+        if compiled is None:
+            getters = tuple((name, self._getter(name)) for name in key)
+
+            def compiled(obj):
+                return {name: get(obj) for name, get in getters}
+
+            if len(self._compiled) >= self.MAX_COMPILED:
+                self._compiled.clear()
+            self._compiled[key] = compiled
+
+        return compiled
+
+    def _getter(self, name):
+        if name in self.derived:
+            return self.derived[name][1]
+
+        get = attrgetter(name)
+        if isinstance(self.model.__table__.c[name].type, (Date, DateTime)):
+            return lambda obj: _isoformat(get(obj))
+        return get
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+def _brand_summary(product):
+    if not product.brand:
+        return None
+    return {'id': product.brand.id, 'name': product.brand.name, 'slug': product.brand.slug}
+
+
+PRODUCT_FIELDS = Fieldset(Product, (
+    'id', 'title', 'description', 'image_url', 'price', 'category', 'product_type',
+    'style_tag', 'artist', 'size', 'color', 'material', 'stock_quantity',
+    'has_3d_model', 'model_3d_url', 'model_scale', 'model_position',
+    'brand_id', 'brand_name', 'brand', 'created_at', 'is_active'
+), derived={
+    'brand_name': (('brand_id',), lambda product: product.brand.name if product.brand else None),
+    'brand': (('brand_id',), _brand_summary),
+}, extra=('brand',))
+
+ORDER_ITEM_FIELDS = Fieldset(OrderItem, (
+    'id', 'order_id', 'product_id', 'quantity', 'unit_price', 'total_price', 'size', 'color',
+    'customization_data', 'product', 'created_at'
+), derived={
+    'product': (('product_id',), lambda item: PRODUCT_FIELDS.serialize(item.product) if item.product else None),
+})
+
+CART_ITEM_FIELDS = Fieldset(CartItem, (
+    'id', 'cart_id', 'product_id', 'quantity', 'size', 'color', 'product', 'created_at', 'updated_at'
+), derived={
+    'product': (('product_id',), lambda item: PRODUCT_FIELDS.serialize(item.product) if item.product else None),
+})
+
+ORDER_FIELDS = Fieldset(Order, (
+    'id', 'order_number', 'user_id', 'status', 'total_amount', 'subtotal', 'tax_amount',
+    'shipping_amount', 'shipping_address', 'billing_address', 'notes', 'tracking_number',
+    'carrier', 'estimated_delivery', 'delivered_at', 'cancelled_at', 'cancellation_reason',
+    'created_at', 'updated_at', 'items_count', 'items'
+), derived={
+    'items_count': ((), lambda order: len(order.items) if order.items else 0),
+    'items': ((), lambda order: [ORDER_ITEM_FIELDS.serialize(item) for item in order.items]),
+}, extra=('items',))
+
+USER_FIELDS = Fieldset(User, (
+    'id', 'name', 'email', 'role', 'preferences', 'brand_id', 'brand_name', 'created_at',
+    'bio', 'location', 'website', 'phone', 'avatar_url', 'banner_url'
+), derived={
+    'brand_name': (('brand_id',), lambda user: user.brand.name if user.brand else None),
+})
+
+BRAND_FIELDS = Fieldset(Brand, (
+    'id', 'name', 'slug', 'description', 'logo_url', 'website', 'contact_email',
+    'established_year', 'subdomain', 'category', 'created_at', 'is_active', 'products_count'
+), derived={
+    'products_count': ((), lambda brand: len(brand.products) if brand.products else 0),
+})
@@ -0,0 +1,93 @@
+# backend_app/utils/http_client.py
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Default (connect, read) timeout in seconds for every outbound call
+DEFAULT_TIMEOUT = (5, 30)
+
+# Keep-alive pool size per upstream host; anything else uses DEFAULT_POOL_SIZE
+DEFAULT_POOL_SIZE = 10
+HOST_POOL_SIZES = {
+    'https://api.safaricom.co.ke': 20,
+    'https://sandbox.safaricom.co.ke': 10,
+    'https://accounts.google.com': 10,
+    'https://oauth2.googleapis.com': 10,
+    'https://openidconnect.googleapis.com': 10,
+}
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies DEFAULT_TIMEOUT when the caller passes none"""
+
+    def __init__(self, *args, timeout=DEFAULT_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def _retry_policy():
+    # Connection failures are retried for any method (nothing reached the server).
+    # Read/status retries are limited to idempotent methods so an STK push or
+    # token exchange is never sent twice.
+    return Retry(
+        total=3,
+        connect=3,
+        read=2,
+        status=2,
+        backoff_factor=0.3,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        raise_on_status=False,
+    )
+
+
+def _build_session():
+    session = requests.Session()
+
+    default_adapter = TimeoutHTTPAdapter(
+        pool_connections=DEFAULT_POOL_SIZE,
+        pool_maxsize=DEFAULT_POOL_SIZE,
+        max_retries=_retry_policy()
+    )
+    session.mount('https://', default_adapter)
+    session.mount('http://', default_adapter)
+
+    for prefix, size in HOST_POOL_SIZES.items():
+        session.mount(prefix, TimeoutHTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=size,
+            max_retries=_retry_policy()
+        ))
+
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Returns the process-wide requests.Session. It is created lazily so every
+    gunicorn worker builds its own connection pools after forking.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get(url, **kwargs):
+    return get_session().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_session().post(url, **kwargs)
@@ -0,0 +1,59 @@
+# backend_app/utils/json_provider.py
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pinned in requirements.txt; without it the standard library encoder is used
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson (a requirement; the app still runs
+    on the standard library encoder where it is not installed).
+
+    Output decodes to the same values as the default provider: keys are
+    sorted, and datetimes, Decimals and other types orjson does not know go
+    through Flask's default() hook, so dates keep their HTTP-date format.
+    orjson always writes compact UTF-8; anything it cannot handle (extra
+    json.dumps() arguments, integers over 64 bits) falls back to the
+    standard library.
+    """
+
+    OPTIONS = (orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+               if orjson else 0)
+
+    def dumps(self, obj, **kwargs):
+        encoded = self._encode(obj, **kwargs)
+        if encoded is None:
+            return super().dumps(obj, **kwargs)
+        return encoded.decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                pass
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = 2 if (self.compact is None and self._app.debug) or self.compact is False else None
+
+        # Hand the encoded bytes straight to the response, skipping str round trips
+        encoded = self._encode(obj, indent=indent)
+        if encoded is None:
+            return super().response(obj)
+        return self._app.response_class(encoded + b'\n', mimetype=self.mimetype)
+
+    def _encode(self, obj, indent=None, separators=None, **kwargs):
+        """orjson bytes for obj, or None when the standard library must do it"""
+        if orjson is None or kwargs or indent not in (None, 2) or not self.sort_keys:
+            return None
+
+        options = self.OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(obj, default=self.default, option=options)
+        except orjson.JSONEncodeError:
+            return None
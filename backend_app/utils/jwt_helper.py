@@ -1,7 +1,110 @@
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity, get_jwt, create_access_token
 from functools import wraps
-from flask import jsonify, request
+from flask import jsonify, request, g, current_app
+from backend_app.extensions import db
 from backend_app.models.user import User
+import time
+
+
+def load_user(user_id):
+    """
+    Returns the User for user_id, querying the database at most once per request.
+    Stacked decorators and get_current_user() calls all share the result on flask.g.
+    """
+    key = str(user_id)
+    cache = g.setdefault('_user_cache', {})
+    if key not in cache:
+        cache[key] = User.query.get(user_id)
+    return cache[key]
+
+
+class RevokedTokenError(Exception):
+    pass
+
+
+class TokenVersionCache:
+    """
+    Short-lived, process-local copy of users.token_version, so claims-only
+    requests can check revocation without reading the users table every time.
+    """
+
+    MAX_ENTRIES = 10000
+
+    def __init__(self):
+        self._versions = {}  # user_id -> (token_version, expires_at)
+
+    def get(self, user_id, ttl):
+        entry = self._versions.get(user_id)
+        now = time.monotonic()
+        if entry and now < entry[1]:
+            return entry[0]
+
+        version = db.session.query(User.token_version).filter(User.id == user_id).scalar()
+        if len(self._versions) >= self.MAX_ENTRIES:
+            self._versions.clear()
+        self._versions[user_id] = (version, now + ttl)
+        return version
+
+    def forget(self, user_id):
+        self._versions.pop(user_id, None)
+
+
+token_versions = TokenVersionCache()
+
+
+class ClaimsUser:
+    """
+    Stand-in for User built from JWT claims (id, role, brand_id). Touching any
+    other attribute loads the real row once and delegates to it.
+    """
+
+    def __init__(self, user_id, claims):
+        self.id = int(user_id)
+        self.role = claims.get('role')
+        self.brand_id = claims.get('brand_id')
+        self._user = None
+
+    def __getattr__(self, name):
+        if self._user is None:
+            self._user = load_user(self.id)
+            if self._user is None:
+                raise AttributeError(name)
+        return getattr(self._user, name)
+
+
+def claims_for_user(user):
+    """Claims that let decorators authorize without loading the user"""
+    return {
+        'role': user.role,
+        'brand_id': user.brand_id,
+        'ver': user.token_version or 0
+    }
+
+
+def revoke_user_tokens(user):
+    """Invalidate every token issued to user so far (committed by the caller)"""
+    user.token_version = (user.token_version or 0) + 1
+    token_versions.forget(user.id)
+
+
+def resolve_user(user_id):
+    """
+    Returns the user behind the verified JWT. With JWT_CLAIMS_AUTH enabled and a
+    token carrying role claims this is a ClaimsUser and no users row is read;
+    otherwise it is the User row. Raises RevokedTokenError for revoked tokens.
+    """
+    claims = get_jwt()
+
+    if current_app.config.get('JWT_CLAIMS_AUTH') and 'role' in claims:
+        version = token_versions.get(int(user_id), current_app.config['JWT_TOKEN_VERSION_TTL'])
+        if version is None or version != claims.get('ver', 0):
+            raise RevokedTokenError('Token has been revoked')
+        return ClaimsUser(user_id, claims)
+
+    user = load_user(user_id)
+    if user and 'ver' in claims and claims['ver'] != (user.token_version or 0):
+        raise RevokedTokenError('Token has been revoked')
+    return user
 
 
 def token_required(f):
@@ -19,7 +122,7 @@ def token_required(f):
             if not user_id:
                 return jsonify({'error': 'Token is invalid'}), 401
 
-            current_user = User.query.get(user_id)
+            current_user = resolve_user(user_id)
 
             if not current_user:
                 return jsonify({'error': 'User not found'}), 404
@@ -44,7 +147,7 @@ def admin_required(f):
             verify_jwt_in_request()
             claims = get_jwt()
             user_id = get_jwt_identity()
-            current_user = User.query.get(user_id)
+            current_user = resolve_user(user_id)
 
             if not current_user:
                 return jsonify({'error': 'User not found'}), 404
@@ -84,7 +187,7 @@ def get_current_user():
         user_id = get_jwt_identity()
         if not user_id:
             return None
-        user = User.query.get(user_id)
+        user = resolve_user(user_id)
         return user
     except Exception as e:
         print("JWT Error:", e)
@@ -116,7 +219,7 @@ def cart_token_optional(f):
             verify_jwt_in_request(optional=True)
             user_id = get_jwt_identity()
             if user_id:
-                current_user = User.query.get(user_id)
+                current_user = resolve_user(user_id)
         except:
             # Token is invalid or expired, treat as guest
             current_user = None
@@ -1,5 +1,7 @@
-import base64, requests, datetime, os
+import base64, datetime, os
 from requests.auth import HTTPBasicAuth
+from backend_app.utils import http_client
+from backend_app.utils.token_cache import mpesa_token_cache
 
 MPESA_SHORTCODE = os.getenv("MPESA_SHORTCODE")
 MPESA_PASSKEY = os.getenv("MPESA_PASSKEY")
@@ -18,8 +20,13 @@ def get_access_token():
     else:
         url = "https://sandbox.safaricom.co.ke/oauth/v1/generate?grant_type=client_credentials"
 
-    r = requests.get(url, auth=HTTPBasicAuth(CONSUMER_KEY, CONSUMER_SECRET))
-    return r.json().get("access_token")
+    def fetch():
+        data = http_client.get(url, auth=HTTPBasicAuth(CONSUMER_KEY, CONSUMER_SECRET)).json()
+        return data["access_token"], int(data.get("expires_in", 3599))
+
+    # Same cache key shape as PaymentService, so both share one token per app
+    base_url = url.split("/oauth/")[0]
+    return mpesa_token_cache.get((base_url, CONSUMER_KEY), fetch)
 
 
 def lipa_na_mpesa_stk(amount, order_id, phone_number):
@@ -57,5 +64,5 @@ def lipa_na_mpesa_stk(amount, order_id, phone_number):
     )
 
     headers = {"Authorization": f"Bearer {access_token}"}
-    response = requests.post(stk_url, json=payload, headers=headers)
+    response = http_client.post(stk_url, json=payload, headers=headers)
     return response.json()
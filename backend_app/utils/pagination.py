@@ -0,0 +1,74 @@
+# backend_app/utils/pagination.py
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import func, or_, tuple_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at, row_id):
+    """
+    Encodes a (created_at, id) position into an opaque, URL-safe cursor string.
+    """
+    payload = [created_at.isoformat() if created_at else None, row_id]
+    raw = json.dumps(payload, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decodes a cursor produced by encode_cursor back into (created_at, id);
+    created_at is None for rows without one. Raises InvalidCursor if the
+    value was tampered with or is malformed.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(created_at) if created_at is not None else None), int(row_id)
+    except (ValueError, TypeError):
+        raise InvalidCursor('Invalid cursor')
+
+
+def clamp_page_size(limit, default, maximum):
+    """Falls back to the default page size and never exceeds the maximum."""
+    if not limit or limit < 1:
+        return default
+    return min(limit, maximum)
+
+
+def keyset_paginate(query, model, cursor=None, limit=24):
+    """
+    Newest-first keyset pagination over (created_at, id).
+
+    Instead of OFFSET, each page seeks past the last row of the previous page,
+    so page N costs the same as page 1 when (created_at, id) is indexed.
+    Rows without created_at come first, which is the order a backward scan
+    of that index gives on Postgres. Returns (rows, next_cursor);
+    next_cursor is None on the last page.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if created_at is None:
+            # Still among the undated rows: the rest of them, then every dated row
+            query = query.filter(or_(model.created_at.isnot(None), model.id < row_id))
+        else:
+            column = model.created_at
+            if query.session.get_bind().dialect.name == 'sqlite':
+                # SQLite keeps timestamps as text, so compare them as numbers instead
+                column, created_at = func.julianday(column), func.julianday(created_at)
+            # NULL never compares, so the undated rows (already served) drop out here
+            query = query.filter(tuple_(column, model.id) < tuple_(created_at, row_id))
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.order_by(model.created_at.desc().nulls_first(), model.id.desc()).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+
+    return rows, next_cursor
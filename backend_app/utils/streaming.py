@@ -0,0 +1,35 @@
+# backend_app/utils/streaming.py
+from flask import Response, current_app, stream_with_context
+
+
+def stream_json_array(query, serialize, batch_size=500):
+    """
+    Response that writes a JSON array of serialize(row) for every row of query.
+
+    Rows come from a server-side cursor (yield_per) and are encoded a batch at
+    a time, so memory stays flat whatever the result size; the status code is
+    sent before the first row, so errors while streaming cannot change it.
+    The body decodes to the same list jsonify() would have returned.
+    """
+    dumps = current_app.json.dumps
+
+    def generate():
+        separator = '['
+        chunk = []
+        # Executed as a 2.0 statement: legacy Query.__iter__ de-duplicates rows
+        # whenever eager joins are present, which rules out yield_per
+        result = query.session.execute(query.statement, execution_options={'yield_per': batch_size})
+        if len(query.column_descriptions) == 1:
+            result = result.scalars()
+
+        for row in result:
+            chunk.append(separator + dumps(serialize(row)))
+            separator = ','
+            if len(chunk) >= batch_size:
+                yield ''.join(chunk)
+                chunk = []
+
+        chunk.append(']' if separator == ',' else '[]')
+        yield ''.join(chunk)
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
@@ -0,0 +1,85 @@
+# backend_app/utils/token_cache.py
+import threading
+import time
+
+
+class AccessTokenCache:
+    """
+    Process-wide cache for provider OAuth access tokens.
+
+    fetch callables return (token, expires_in_seconds). A token is served from
+    memory until it gets within refresh_margin seconds of expiry; from then on
+    exactly one thread refreshes it while the others keep using the still-valid
+    token. Only an expired (or missing) token makes callers wait for the lock.
+    """
+
+    def __init__(self, refresh_margin=60):
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (token, expires_at on the monotonic clock)
+        # Counters get their own lock: _lock is held across a token fetch
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, fetch):
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry and now < entry[1] - self.refresh_margin:
+            self._count('hits')
+            return entry[0]
+
+        if entry and now < entry[1]:
+            # Refresh window: whoever gets the lock refreshes, everyone else
+            # carries on with the current token instead of queueing up
+            if not self._lock.acquire(blocking=False):
+                self._count('hits')
+                return entry[0]
+        else:
+            self._lock.acquire()
+
+        try:
+            # Another thread may have refreshed while we waited for the lock
+            entry = self._entries.get(key)
+            if entry and time.monotonic() < entry[1] - self.refresh_margin:
+                self._count('hits')
+                return entry[0]
+
+            self._count('misses')
+            try:
+                token, expires_in = fetch()
+            except Exception:
+                # A failed early refresh shouldn't fail callers while the old token is valid
+                if entry and time.monotonic() < entry[1]:
+                    return entry[0]
+                raise
+            self._entries[key] = (token, time.monotonic() + float(expires_in))
+            return token
+        finally:
+            self._lock.release()
+
+    def invalidate(self, key=None):
+        """Drop one cached token (e.g. after the provider rejected it) or all of them"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self):
+        with self._stats_lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'cached_tokens': len(self._entries)
+            }
+
+    def _count(self, name):
+        # Request threads share the cache; += on an attribute is not atomic
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+
+# Shared by PaymentService and utils/mpesa_service for Daraja OAuth tokens
+mpesa_token_cache = AccessTokenCache()
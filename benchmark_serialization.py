@@ -0,0 +1,78 @@
+# benchmark_serialization.py
+"""
+Micro-benchmark for listing serialization: Product.to_dict() + the standard
+json encoder against the compiled PRODUCT_FIELDS serializer + OrjsonProvider.
+
+Runs against an in-memory SQLite database, so it needs no server:
+
+    python benchmark_serialization.py [rows] [repeats]
+"""
+import json
+import sys
+import time
+from backend_app import create_app
+from backend_app.config import Config
+from backend_app.extensions import db
+from backend_app.models.brand import Brand
+from backend_app.models.product import Product
+from backend_app.utils.fieldsets import PRODUCT_FIELDS
+from backend_app.utils.json_provider import orjson
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.orm import contains_eager
+
+
+class BenchmarkConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+
+
+def best_of(repeats, func):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(rows=5000, repeats=5):
+    app = create_app(BenchmarkConfig)
+
+    with app.app_context():
+        brand = Brand(name='Benchmark Brand', slug='benchmark', subdomain='benchmark', category='clothing')
+        db.session.add(brand)
+        db.session.flush()
+        db.session.add_all([
+            Product(title=f'Product {i}', description='Benchmark product', image_url='https://example.com/p.png',
+                    price=100 + i, category='tshirt', product_type='clothing', style_tag='street',
+                    artist='Artist', size='M', color='black', stock_quantity=10, brand_id=brand.id)
+            for i in range(rows)
+        ])
+        db.session.commit()
+
+        products = (Product.query
+                    .outerjoin(Product.brand)
+                    .options(contains_eager(Product.brand))
+                    .all())
+
+        stdlib = DefaultJSONProvider(app)
+        serialize = PRODUCT_FIELDS.serializer()
+
+        def to_dict_stdlib():
+            return stdlib.dumps([product.to_dict() for product in products], separators=(',', ':'))
+
+        def compiled_orjson():
+            return app.json.dumps([serialize(product) for product in products])
+
+        assert json.loads(to_dict_stdlib()) == json.loads(compiled_orjson())
+
+        baseline = best_of(repeats, to_dict_stdlib)
+        candidate = best_of(repeats, compiled_orjson)
+
+    encoder = 'orjson' if orjson else 'json (orjson not installed)'
+    print(f"{rows} products, best of {repeats}")
+    print(f"  {'to_dict() + json':<42}{baseline * 1000:8.1f} ms")
+    print(f"  {'compiled + ' + encoder:<42}{candidate * 1000:8.1f} ms  ({baseline / candidate:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,33 @@
+"""Add products full-text search vector with GIN index
+
+Revision ID: b7e2d9a1c4f3
+Revises: a3f1c2d4e5b6
+Create Date: 2026-10-17 10:03:17.519846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e2d9a1c4f3'
+down_revision = 'a3f1c2d4e5b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Generated column: Postgres keeps it in sync on every INSERT/UPDATE
+    op.execute(
+        "ALTER TABLE products ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(artist, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+        ") STORED"
+    )
+    op.execute("CREATE INDEX ix_products_search_vector ON products USING GIN (search_vector)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_products_search_vector")
+    op.execute("ALTER TABLE products DROP COLUMN IF EXISTS search_vector")
@@ -0,0 +1,31 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend_app import create_app
+from backend_app.config import Config
+from backend_app.extensions import db
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+
+
+@pytest.fixture
+def app():
+    """A fresh app on an in-memory SQLite database (create_app builds the schema)"""
+    app = create_app(TestConfig)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,79 @@
+# tests/test_order_query_count.py
+from sqlalchemy import event
+
+from backend_app.extensions import db
+from backend_app.models.brand import Brand
+from backend_app.models.order import Order, OrderItem
+from backend_app.models.product import Product
+from backend_app.models.user import User
+from backend_app.utils.jwt_helper import generate_token
+
+# Statements GET /api/orders/ may issue for a page of any size: the user,
+# the total, the orders, their items and the items' products with brands.
+MAX_LISTING_STATEMENTS = 5
+
+
+def seed_orders(app, n_orders, items_per_order=3, n_brands=5, products_per_brand=4):
+    """n_orders orders spread over products of several brands; returns an admin token"""
+    with app.app_context():
+        brands = [Brand(name=f'Brand {i}', category='clothing', slug=f'brand-{i}', subdomain=f'brand-{i}')
+                  for i in range(n_brands)]
+        db.session.add_all(brands)
+        db.session.flush()
+
+        products = [Product(title=f'Tee {brand.id}-{i}', description='Tee', image_url='tee.png', price=100 + i,
+                            category='tshirt', product_type='clothing', style_tag='rock', artist='Artist',
+                            stock_quantity=10, brand_id=brand.id)
+                    for brand in brands for i in range(products_per_brand)]
+        admin = User(name='Admin', email='admin@example.com', role='super_admin', brand_id=brands[0].id)
+        admin.set_password('password')
+        customer = User(name='Customer', email='customer@example.com', role='customer', brand_id=brands[0].id)
+        customer.set_password('password')
+        db.session.add_all([*products, admin, customer])
+        db.session.flush()
+
+        for n in range(n_orders):
+            order = Order(user_id=customer.id, order_number=f'ORD-{n:05d}', subtotal=300, total_amount=348,
+                          shipping_address={'city': 'Nairobi'})
+            for i in range(items_per_order):
+                product = products[(n + i) % len(products)]
+                order.items.append(OrderItem(product_id=product.id, quantity=1,
+                                             unit_price=product.price, total_price=product.price))
+            db.session.add(order)
+
+        db.session.commit()
+        return generate_token(admin.id)
+
+
+def count_statements(app, request):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = request()
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+    return response, statements
+
+
+def test_order_listing_issues_a_constant_number_of_statements(app, client):
+    token = seed_orders(app, n_orders=50)
+    headers = {'Authorization': f'Bearer {token}'}
+
+    small, small_statements = count_statements(app, lambda: client.get('/api/orders/?limit=5', headers=headers))
+    full, full_statements = count_statements(app, lambda: client.get('/api/orders/?limit=50', headers=headers))
+
+    assert small.status_code == 200
+    assert full.status_code == 200
+    orders = full.get_json()['orders']
+    assert len(orders) == 50
+    assert all(len(order['items']) == 3 for order in orders)
+    assert all(item['product']['brand_name'] for order in orders for item in order['items'])
+
+    assert len(full_statements) <= MAX_LISTING_STATEMENTS, full_statements
+    assert len(full_statements) == len(small_statements)
@@ -0,0 +1,98 @@
+# tests/test_stock_concurrency.py
+import os
+import threading
+
+import pytest
+from sqlalchemy import create_engine
+
+from backend_app import create_app
+from backend_app.config import Config
+from backend_app.extensions import db
+from backend_app.models.brand import Brand
+from backend_app.models.product import Product
+from backend_app.services.inventory_service import InsufficientStockError, InventoryService
+
+# A disposable Postgres database: the schema is created and dropped around each test
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+WORKERS = 12
+UNITS_LEFT = 3
+
+
+@pytest.fixture
+def pg_app():
+    if not TEST_DATABASE_URL:
+        pytest.skip('TEST_DATABASE_URL is not set')
+    try:
+        engine = create_engine(TEST_DATABASE_URL)
+        with engine.connect():
+            pass
+        engine.dispose()
+    except Exception as e:
+        pytest.skip(f'Postgres is unavailable: {e}')
+
+    class PostgresConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = TEST_DATABASE_URL
+        SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': WORKERS, 'max_overflow': 0}
+
+    app = create_app(PostgresConfig)
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
+
+
+def seed_products(app, count):
+    with app.app_context():
+        brand = Brand(name='Brand', category='clothing', slug='brand', subdomain='brand')
+        db.session.add(brand)
+        db.session.flush()
+        products = [Product(title=f'Last tee {i}', description='Tee', image_url='tee.png', price=100,
+                            category='tshirt', product_type='clothing', style_tag='rock', artist='Artist',
+                            stock_quantity=UNITS_LEFT, brand_id=brand.id)
+                    for i in range(count)]
+        db.session.add_all(products)
+        db.session.commit()
+        return [product.id for product in products]
+
+
+def checkout_concurrently(app, quantities):
+    """WORKERS checkouts of `quantities` released at once; returns how many succeeded"""
+    start = threading.Barrier(WORKERS)
+    outcomes = []
+    lock = threading.Lock()
+
+    def checkout():
+        with app.app_context():
+            start.wait()
+            try:
+                InventoryService.reserve_stock(quantities)
+                db.session.commit()
+                outcome = True
+            except InsufficientStockError:
+                db.session.rollback()
+                outcome = False
+            with lock:
+                outcomes.append(outcome)
+
+    threads = [threading.Thread(target=checkout) for _ in range(WORKERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(outcomes) == WORKERS
+    return outcomes.count(True)
+
+
+@pytest.mark.parametrize('product_count', [1, 2])
+def test_concurrent_checkouts_sell_exactly_the_units_left(pg_app, product_count):
+    product_ids = seed_products(pg_app, product_count)
+
+    succeeded = checkout_concurrently(pg_app, {product_id: 1 for product_id in product_ids})
+
+    assert succeeded == UNITS_LEFT
+    with pg_app.app_context():
+        stock = [quantity for (quantity,) in db.session.query(Product.stock_quantity).order_by(Product.id)]
+    assert stock == [0] * product_count